@@ -0,0 +1,220 @@
+"""Latency and throughput benchmarks for the AVGear Matrix coordinator.
+
+Drives AVGearMatrixDataUpdateCoordinator against the local simulator, no
+physical matrix needed. Run from the repository root with the integration's
+requirements (homeassistant, hdmimatrix) installed:
+
+    python -m benchmarks.bench_coordinator --outputs 8 --latency 0.01 --json out.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+import json
+import logging
+import random
+import statistics
+import tempfile
+from time import perf_counter
+from types import MappingProxyType
+from typing import Any
+
+from hdmimatrix import AsyncHDMIMatrix
+
+from homeassistant.config_entries import SOURCE_USER, ConfigEntry
+from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import HomeAssistant
+
+from custom_components.avgear_matrix.const import DOMAIN
+from custom_components.avgear_matrix.coordinator import (
+    AVGearMatrixDataUpdateCoordinator,
+)
+
+from .simulator import MatrixSimulator, SimulatorConfig
+
+HOST = "127.0.0.1"
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    """Summarise latencies in milliseconds."""
+    if len(samples) < 2:
+        samples = samples * 2 or [0.0, 0.0]
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {
+        "count": len(samples),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 2),
+        "p50_ms": round(cuts[49] * 1000, 2),
+        "p90_ms": round(cuts[89] * 1000, 2),
+        "p99_ms": round(cuts[98] * 1000, 2),
+        "max_ms": round(max(samples) * 1000, 2),
+    }
+
+
+async def _async_timed(operation: Callable[[], Awaitable[Any]]) -> float:
+    start = perf_counter()
+    await operation()
+    return perf_counter() - start
+
+
+class Bench:
+    """A Home Assistant core, a simulator and a coordinator wired together."""
+
+    def __init__(self, config: SimulatorConfig, config_dir: str) -> None:
+        """Initialize the bench."""
+        self.simulator = MatrixSimulator(config)
+        self.hass = HomeAssistant(config_dir)
+        self.coordinator: AVGearMatrixDataUpdateCoordinator
+
+    async def __aenter__(self) -> Bench:
+        """Start the simulator and set up the coordinator."""
+        port = await self.simulator.start(HOST)
+        entry = ConfigEntry(
+            data={CONF_HOST: HOST, CONF_PORT: port},
+            discovery_keys=MappingProxyType({}),
+            domain=DOMAIN,
+            minor_version=1,
+            options={},
+            source=SOURCE_USER,
+            subentries_data=None,
+            title=f"Simulator {port}",
+            unique_id=f"{HOST}:{port}",
+            version=1,
+        )
+        self.coordinator = AVGearMatrixDataUpdateCoordinator(
+            self.hass, entry, AsyncHDMIMatrix(HOST, port), HOST, port
+        )
+        await self.coordinator.async_get_device_info()
+        await self.coordinator.async_refresh()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Tear everything down."""
+        await self.coordinator.async_shutdown()
+        await self.simulator.stop()
+        await self.hass.async_stop(force=True)
+
+    async def async_bench_polls(self, iterations: int) -> dict[str, Any]:
+        """Time full polls and routing-only polls."""
+        coordinator = self.coordinator
+        full, routing = [], []
+        for _ in range(iterations):
+            # Forget when each data class was fetched so all of them are due
+            coordinator._last_fetched.clear()
+            full.append(await _async_timed(coordinator.async_refresh))
+        # Past the activity window only routing is due
+        coordinator._last_activity = -1e9
+        for _ in range(iterations):
+            routing.append(await _async_timed(coordinator.async_refresh))
+        return {"full": percentiles(full), "routing_only": percentiles(routing)}
+
+    async def async_bench_routes(self, iterations: int) -> dict[str, Any]:
+        """Time single route commands as sent by a select entity."""
+        coordinator = self.coordinator
+        rng = random.Random(0)
+        samples = []
+        for _ in range(iterations):
+            output = rng.randint(1, coordinator.num_outputs)
+            input_num = rng.randint(1, coordinator.num_inputs)
+            samples.append(
+                await _async_timed(
+                    lambda: coordinator.async_route_input_to_output(input_num, output)
+                )
+            )
+        return percentiles(samples)
+
+    async def async_bench_bursts(self, bursts: int, size: int) -> dict[str, Any]:
+        """Fire bursts of concurrent select changes, measure throughput."""
+        coordinator = self.coordinator
+        rng = random.Random(1)
+        sent = len(self.simulator.stats.commands)
+        samples = []
+        start = perf_counter()
+        for _ in range(bursts):
+            routes = [
+                (
+                    rng.randint(1, coordinator.num_inputs),
+                    rng.randint(1, coordinator.num_outputs),
+                )
+                for _ in range(size)
+            ]
+            samples.extend(
+                await asyncio.gather(
+                    *(
+                        _async_timed(
+                            lambda input_num=input_num, output=output: (
+                                coordinator.async_route_input_to_output(
+                                    input_num, output
+                                )
+                            )
+                        )
+                        for input_num, output in routes
+                    )
+                )
+            )
+        elapsed = perf_counter() - start
+        return {
+            "commands": bursts * size,
+            "commands_per_second": round(bursts * size / elapsed, 1),
+            "device_commands": len(self.simulator.stats.commands) - sent,
+            "latency": percentiles(samples),
+        }
+
+    def connection_stats(self) -> dict[str, int]:
+        """Return connection counts seen by both ends."""
+        return {
+            "session_connects": self.coordinator.session.connect_count,
+            "device_connections": self.simulator.stats.connections,
+            "device_drops": self.simulator.stats.drops,
+        }
+
+
+async def async_run(args: argparse.Namespace) -> dict[str, Any]:
+    """Run every benchmark and return the results."""
+    config = SimulatorConfig(
+        inputs=args.inputs,
+        outputs=args.outputs,
+        latency=args.latency,
+        jitter=args.jitter,
+        drop_rate=args.drop_rate,
+        seed=0,
+    )
+    with tempfile.TemporaryDirectory() as config_dir:
+        async with Bench(config, config_dir) as bench:
+            results = {
+                "config": vars(args),
+                "poll": await bench.async_bench_polls(args.iterations),
+                "route": await bench.async_bench_routes(args.iterations),
+                "burst": await bench.async_bench_bursts(
+                    args.iterations, args.burst_size
+                ),
+            }
+            results["connections"] = bench.connection_stats()
+    return results
+
+
+def main() -> None:
+    """Run the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--inputs", type=int, default=4)
+    parser.add_argument("--outputs", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--burst-size", type=int, default=8)
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--debug", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.WARNING)
+
+    results = asyncio.run(async_run(args))
+    print(json.dumps(results, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""Entity setup and state write benchmarks for growing matrix sizes.
+
+Sets the integration up in a minimal Home Assistant core against simulated
+NxN matrices and reports, per size, how long creating the entities takes and
+what writing their state costs, per entity, so it is easy to check both grow
+linearly. Run from the repository root with the integration's requirements
+(homeassistant, hdmimatrix) installed:
+
+    python -m benchmarks.bench_entities --sizes 4 16 64 --json out.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import tempfile
+from time import perf_counter
+from types import MappingProxyType
+from typing import Any
+
+from homeassistant import loader
+from homeassistant.config_entries import SOURCE_USER, ConfigEntries, ConfigEntry
+from homeassistant.const import CONF_HOST, CONF_PORT, EVENT_STATE_CHANGED
+from homeassistant.core import CoreState, Event, HomeAssistant, callback
+from homeassistant.helpers import (
+    area_registry as ar,
+    category_registry as cr,
+    device_registry as dr,
+    entity_registry as er,
+    floor_registry as fr,
+    issue_registry as ir,
+    label_registry as lr,
+    translation,
+)
+from homeassistant.setup import async_setup_component
+
+from custom_components.avgear_matrix.const import DOMAIN
+
+from .bench_coordinator import HOST, percentiles
+from .simulator import MatrixSimulator, SimulatorConfig
+
+INTEGRATION_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "custom_components",
+    DOMAIN,
+)
+
+
+async def async_start_hass(config_dir: str) -> HomeAssistant:
+    """Start the parts of Home Assistant entities need, no HTTP or frontend."""
+    os.makedirs(os.path.join(config_dir, "custom_components"))
+    os.symlink(INTEGRATION_DIR, os.path.join(config_dir, "custom_components", DOMAIN))
+    hass = HomeAssistant(config_dir)
+    loader.async_setup(hass)
+    translation.async_setup(hass)
+    hass.config_entries = ConfigEntries(hass, {})
+    await asyncio.gather(
+        *(registry.async_load(hass) for registry in (ar, cr, dr, er, fr, ir, lr))
+    )
+    await hass.config_entries.async_initialize()
+    await async_setup_component(hass, "homeassistant", {})
+    # Only the config flow needs it, and it would pull in the HTTP server
+    hass.config.components.add("network")
+    hass.set_state(CoreState.running)
+    return hass
+
+
+async def async_bench_size(
+    hass: HomeAssistant, size: int, iterations: int
+) -> dict[str, Any]:
+    """Measure entity setup and state writes of one NxN matrix."""
+    simulator = MatrixSimulator(SimulatorConfig(inputs=size, outputs=size))
+    port = await simulator.start(HOST)
+    entry = ConfigEntry(
+        data={CONF_HOST: HOST, CONF_PORT: port},
+        discovery_keys=MappingProxyType({}),
+        domain=DOMAIN,
+        minor_version=1,
+        options={},
+        source=SOURCE_USER,
+        subentries_data=None,
+        title=f"Simulator {size}x{size}",
+        unique_id=f"{HOST}:{port}",
+        version=1,
+    )
+    # The first setup probes the device and caches what it found
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+
+    # Later setups start from the cache, leaving entity creation to measure
+    setup = []
+    for _ in range(iterations):
+        await hass.config_entries.async_unload(entry.entry_id)
+        start = perf_counter()
+        await hass.config_entries.async_setup(entry.entry_id)
+        setup.append(perf_counter() - start)
+        await hass.async_block_till_done(wait_background_tasks=True)
+    entities = len(
+        er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id)
+    )
+
+    coordinator = entry.runtime_data
+    writes = 0
+
+    @callback
+    def _async_count(_event: Event) -> None:
+        nonlocal writes
+        writes += 1
+
+    unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, _async_count)
+    write_all, write_one = [], []
+    for iteration in range(iterations):
+        # Every output to another input, then a single output
+        coordinator.data = coordinator.data.evolve(
+            routes={
+                output_num: (output_num + iteration) % size + 1
+                for output_num in range(1, size + 1)
+            }
+        )
+        start = perf_counter()
+        coordinator.async_update_listeners()
+        write_all.append(perf_counter() - start)
+
+        coordinator.data = coordinator.data.evolve(
+            routes={1: (coordinator.data.route(1) - 2) % size + 1}
+        )
+        start = perf_counter()
+        coordinator.async_update_listeners()
+        write_one.append(perf_counter() - start)
+
+    await hass.async_block_till_done()
+    unsub()
+    await hass.config_entries.async_remove(entry.entry_id)
+    await simulator.stop()
+
+    setup_stats = percentiles(setup)
+    write_all_stats = percentiles(write_all)
+    return {
+        "entities": entities,
+        "setup": setup_stats,
+        "setup_per_entity_us": round(setup_stats["p50_ms"] * 1000 / entities, 1),
+        "write_all_outputs": write_all_stats,
+        "write_per_output_us": round(write_all_stats["p50_ms"] * 1000 / size, 1),
+        "write_one_output": percentiles(write_one),
+        # Each round changes every output, then one: at most size + 1 states
+        "state_changes_per_round": writes / iterations,
+    }
+
+
+async def async_run(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the benchmark for every size and return the results."""
+    results: dict[str, Any] = {"config": vars(args)}
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_start_hass(config_dir)
+        try:
+            for size in args.sizes:
+                results[f"{size}x{size}"] = await async_bench_size(
+                    hass, size, args.iterations
+                )
+        finally:
+            await hass.async_stop(force=True)
+    return results
+
+
+def main() -> None:
+    """Run the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[4, 8, 16, 32, 64])
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--debug", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.WARNING)
+
+    results = asyncio.run(async_run(args))
+    print(json.dumps(results, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
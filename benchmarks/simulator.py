@@ -0,0 +1,220 @@
+"""Local stand-in for an AVGear matrix speaking its TCP control protocol.
+
+Run on its own to point a Home Assistant instance at it:
+
+    python -m benchmarks.simulator --port 4001 --outputs 8 --latency 0.02
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+import logging
+import random
+import re
+
+_LOGGER = logging.getLogger(__name__)
+
+ROUTE_RE = re.compile(r"OUT(\d\d):(\d\d)\.")
+OUTPUT_POWER_RE = re.compile(r"([@$])OUT(\d\d)\.")
+
+
+@dataclass
+class SimulatorConfig:
+    """Behaviour of the simulated matrix."""
+
+    inputs: int = 4
+    outputs: int = 4
+    model: str = "HDP-MXB44"
+    device_type: str = "4x4 HDMI HDBaseT Matrix"
+    version: str = "V1.2"
+    latency: float = 0.0  # seconds to process each command
+    jitter: float = 0.0  # up to this many seconds added to the latency
+    drop_rate: float = 0.0  # chance of dropping the connection per command
+    banner: str = ""  # sent on connect, the library waits 1s when empty
+    seed: int | None = None
+
+
+@dataclass
+class SimulatorStats:
+    """What the simulated matrix has seen."""
+
+    connections: int = 0
+    drops: int = 0
+    commands: list[str] = field(default_factory=list)
+
+
+class MatrixSimulator:
+    """Asyncio TCP server emulating an AVGear HDMI matrix."""
+
+    def __init__(self, config: SimulatorConfig | None = None) -> None:
+        """Initialize the simulator."""
+        self.config = config or SimulatorConfig()
+        self.stats = SimulatorStats()
+        self.power = True
+        self.hdbt_power = True
+        self.routes = {output: 1 for output in range(1, self.config.outputs + 1)}
+        self.output_power = {output: True for output in self.routes}
+        self.port = 0
+        self._random = random.Random(self.config.seed)
+        self.unplugged = False
+        self._server: asyncio.Server | None = None
+        self._writers: set[asyncio.StreamWriter] = set()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Start listening, return the port."""
+        self.unplugged = False
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        _LOGGER.debug("Simulator listening on %s:%s", host, self.port)
+        return self.port
+
+    async def stop(self) -> None:
+        """Stop listening and drop all clients."""
+        self.drop_clients()
+        if self._server is None:
+            return
+        self._server.close()
+        await self._server.wait_closed()
+        self._server = None
+
+    def unplug(self) -> None:
+        """Go silent and stop listening, leaving clients with half-open connections.
+
+        Without a reset from the device the clients only notice once their
+        requests go unanswered, as when a matrix loses power.
+        """
+        self.unplugged = True
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+
+    def drop_clients(self) -> None:
+        """Close every client connection, as a rebooting device would."""
+        for writer in list(self._writers):
+            writer.close()
+
+    def reply(self, command: str) -> str:
+        """Apply a command and return the device's reply."""
+        self.stats.commands.append(command)
+        if command == "PowerON.":
+            self.power = True
+            return "PowerON\r\n"
+        if command == "PowerOFF.":
+            self.power = False
+            return "PowerOFF\r\n"
+        if not self.power:
+            # A powered off matrix ignores everything else
+            return ""
+        if command == "/*Name.":
+            return f"{self.config.model}\r\n"
+        if command == "/*Type.":
+            return f"{self.config.device_type}\r\n"
+        if command == "/^Version.":
+            return f"{self.config.version}\r\n"
+        if command == "STA_VIDEO.":
+            return "".join(
+                f"Output {output:02d} Switch To In {input_num:02d}!\r\n"
+                for output, input_num in self.routes.items()
+            )
+        if command == "STA_IN.":
+            ports = range(1, self.config.inputs + 1)
+            return (
+                f"IN {' '.join(str(port) for port in ports)}\r\n"
+                f"LINK {' '.join('N' for _ in ports)}\r\n"
+            )
+        if command == "STA_POUT.":
+            return "".join(
+                f"Turn {'ON' if on else 'OFF'} Output {output:02d}!\r\n"
+                for output, on in self.output_power.items()
+            )
+        if command == "STA_PHDBT.":
+            return f"PHDBT {'ON' if self.hdbt_power else 'OFF'}!\r\n"
+        if command in ("PHDBTON.", "PHDBTOFF."):
+            self.hdbt_power = command == "PHDBTON."
+            return f"PHDBT {'ON' if self.hdbt_power else 'OFF'}!\r\n"
+        if match := ROUTE_RE.fullmatch(command):
+            output, input_num = int(match[1]), int(match[2])
+            if output in self.routes and 1 <= input_num <= self.config.inputs:
+                self.routes[output] = input_num
+            return f"Output {match[1]} Switch To In {match[2]}!\r\n"
+        if match := OUTPUT_POWER_RE.fullmatch(command):
+            output, on = int(match[2]), match[1] == "@"
+            # Output 00 addresses every output
+            for port in self.output_power if output == 0 else (output,):
+                if port in self.output_power:
+                    self.output_power[port] = on
+            return f"Turn {'ON' if on else 'OFF'} Output {match[2]}!\r\n"
+        return ""
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.stats.connections += 1
+        self._writers.add(writer)
+        buffer = ""
+        try:
+            if self.config.banner:
+                writer.write(self.config.banner.encode())
+            while data := await reader.read(1024):
+                buffer += data.decode("ascii", errors="ignore")
+                # Every command ends with a full stop
+                while "." in buffer:
+                    command, _, buffer = buffer.partition(".")
+                    if await self._async_process(writer, f"{command.strip()}."):
+                        return
+        except ConnectionError:
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _async_process(self, writer: asyncio.StreamWriter, command: str) -> bool:
+        """Reply to one command, return true if the connection was dropped."""
+        config = self.config
+        if self.unplugged:
+            return False
+        if delay := config.latency + self._random.uniform(0, config.jitter):
+            await asyncio.sleep(delay)
+        if config.drop_rate and self._random.random() < config.drop_rate:
+            self.stats.drops += 1
+            _LOGGER.debug("Dropping connection on %s", command)
+            return True
+        writer.write(self.reply(command).encode())
+        await writer.drain()
+        return False
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    simulator = MatrixSimulator(
+        SimulatorConfig(
+            inputs=args.inputs,
+            outputs=args.outputs,
+            latency=args.latency,
+            jitter=args.jitter,
+            drop_rate=args.drop_rate,
+        )
+    )
+    await simulator.start(args.host, args.port)
+    print(f"Simulating a {args.inputs}x{args.outputs} matrix on {args.host}:{simulator.port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await simulator.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4001)
+    parser.add_argument("--inputs", type=int, default=4)
+    parser.add_argument("--outputs", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_async_main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -6,16 +6,31 @@ from hdmimatrix import AsyncHDMIMatrix
 from homeassistant.const import CONF_HOST, CONF_PORT, Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.device_registry import DeviceEntry
+from homeassistant.helpers.typing import ConfigType
 import logging
-from .const import DOMAIN
-from .coordinator import AVGearMatrixConfigEntry, AVGearMatrixDataUpdateCoordinator
+from .const import CONF_FAST_START, DEFAULT_FAST_START, DOMAIN, PROBE_TIMEOUT
+from .coordinator import (
+    AVGearMatrixConfigEntry,
+    AVGearMatrixDataUpdateCoordinator,
+    device_store,
+)
+from .services import async_setup_services
 
 PLATFORMS = [Platform.SELECT, Platform.SENSOR, Platform.SWITCH]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
 _LOGGER = logging.getLogger(__name__)
 
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the AVGear Matrix services."""
+    async_setup_services(hass)
+    return True
+
+
 async def async_setup_entry(
     hass: HomeAssistant, entry: AVGearMatrixConfigEntry
 ) -> bool:
@@ -30,32 +45,58 @@ async def async_setup_entry(
         host,
         port,
     )
-    try:
-        # Using async context manager
-        async with matrix:
-            # Power on the device during initial setup
-            _LOGGER.debug("Powering on device during setup")
-            await matrix.power_on()
-
-            # Wait 2 seconds to ensure device is fully available
-            await asyncio.sleep(2)
-
-            name = await matrix.get_device_name()
-            if not name:
-                raise ConfigEntryNotReady
-    except OSError as error:
-        raise ConfigEntryNotReady from error
-
     coordinator = AVGearMatrixDataUpdateCoordinator(hass, entry, matrix, host, port)
-    # Load static device info once during setup
-    await coordinator.async_get_device_info()
 
-    # Do first data refresh for dynamic data
-    await coordinator.async_config_entry_first_refresh()
+    async def _async_probe(matrix: AsyncHDMIMatrix) -> str:
+        # Power on the device during initial setup
+        _LOGGER.debug("Powering on device during setup")
+        await matrix.power_on()
+
+        # Wait 2 seconds to ensure device is fully available
+        await asyncio.sleep(2)
+
+        return await matrix.get_device_name()
+
+    fast_start = entry.options.get(CONF_FAST_START, DEFAULT_FAST_START)
+    if not (cached := await coordinator.async_load_cache(restore_state=fast_start)):
+        # First start, nothing is known about the device yet
+        try:
+            # The connection opened here is kept by the coordinator's session
+            name = await coordinator.session.async_run(
+                _async_probe, deadline=PROBE_TIMEOUT
+            )
+        except OSError as error:
+            await coordinator.async_close()
+            raise ConfigEntryNotReady from error
+        if not name:
+            await coordinator.async_close()
+            raise ConfigEntryNotReady
+
+        # Load static device info once during setup
+        await coordinator.async_get_device_info()
+
+    if not coordinator.restored:
+        # Do first data refresh for dynamic data
+        await coordinator.async_config_entry_first_refresh()
     entry.runtime_data = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    if coordinator.restored:
+        # Entities start from the last known state, catch up in the background
+        entry.async_create_background_task(
+            hass,
+            coordinator.async_refresh(),
+            f"{DOMAIN} {coordinator.short_id} first refresh",
+        )
+    if cached:
+        # Pick up firmware upgrades or a different chassis without delaying setup
+        entry.async_create_background_task(
+            hass,
+            coordinator.async_refresh_device_info(),
+            f"{DOMAIN} {coordinator.short_id} device info",
+        )
+
     return True
 
 
@@ -63,7 +104,17 @@ async def async_unload_entry(
     hass: HomeAssistant, entry: AVGearMatrixConfigEntry
 ) -> bool:
     """Unload a config entry."""
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        await entry.runtime_data.async_close()
+    return unload_ok
+
+
+async def async_remove_entry(
+    hass: HomeAssistant, entry: AVGearMatrixConfigEntry
+) -> None:
+    """Remove the cached device info of a deleted config entry."""
+    await device_store(hass, entry.entry_id).async_remove()
 
 
 async def async_remove_config_entry_device(
@@ -0,0 +1,69 @@
+"""Circuit breaker for unreachable AVGear matrices."""
+
+from __future__ import annotations
+
+import logging
+from time import monotonic
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Stop talking to a device after repeated failures.
+
+    The circuit opens after threshold consecutive failures. While open only
+    occasional probes are let through, backing off exponentially from
+    min_backoff to max_backoff seconds, and the first success closes it.
+    """
+
+    def __init__(self, threshold: int, min_backoff: float, max_backoff: float) -> None:
+        """Initialize the circuit breaker."""
+        self._threshold = threshold
+        self._min_backoff = min_backoff
+        self._max_backoff = max_backoff
+        self._failures = 0
+        self._backoff = 0.0
+        self._retry_at = 0.0
+
+    @property
+    def closed(self) -> bool:
+        """Return true if the device is considered reachable."""
+        return self._failures < self._threshold
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds until the next probe is due."""
+        return max(0.0, self._retry_at - monotonic())
+
+    def probe_due(self) -> bool:
+        """Return true if the circuit is open and may be probed now."""
+        return not self.closed and monotonic() >= self._retry_at
+
+    def record_success(self) -> bool:
+        """Record a successful exchange, return true if it closed the circuit."""
+        was_open = not self.closed
+        self._failures = 0
+        self._backoff = 0.0
+        return was_open
+
+    def record_failure(self) -> None:
+        """Record a failed exchange, opening the circuit or backing off."""
+        self._failures += 1
+        if self.closed:
+            return
+        self._backoff = min(
+            self._backoff * 2 if self._backoff else self._min_backoff,
+            self._max_backoff,
+        )
+        self._retry_at = monotonic() + self._backoff
+        _LOGGER.debug("Circuit open, next probe in %ss", self._backoff)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state for diagnostics."""
+        return {
+            "closed": self.closed,
+            "consecutive_failures": self._failures,
+            "backoff": self._backoff,
+            "retry_in": round(self.retry_in, 1) if not self.closed else None,
+        }
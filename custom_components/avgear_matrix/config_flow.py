@@ -2,20 +2,44 @@
 
 from __future__ import annotations
 
+import ipaddress
 import logging
-import asyncio
 
 from typing import Any
 
-from hdmimatrix import AsyncHDMIMatrix
-
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
-from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.components import network
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
+from homeassistant.const import CONF_HOST, CONF_PORT, CONF_SCAN_INTERVAL
 from homeassistant.core import callback
 
-from .const import DEFAULT_PORT, DOMAIN
+from .const import (
+    CONF_CONNECT_TIMEOUT,
+    CONF_FAST_START,
+    CONF_OPTIMISTIC_ROUTING,
+    CONF_OUTPUT_POWER_INTERVAL,
+    CONF_POLL_TIMEOUT,
+    CONF_POWER_INTERVAL,
+    CONF_QUERY_TIMEOUT,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_FAST_START,
+    DEFAULT_OPTIMISTIC_ROUTING,
+    DEFAULT_OUTPUT_POWER_INTERVAL,
+    DEFAULT_POLL_TIMEOUT,
+    DEFAULT_PORT,
+    DEFAULT_POWER_INTERVAL,
+    DEFAULT_QUERY_TIMEOUT,
+    DISCOVERY_MAX_HOSTS,
+    DOMAIN,
+    SCAN_INTERVAL,
+)
+from .discovery import DiscoveredMatrix, async_discover, async_identify
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,22 +50,72 @@ DATA_SCHEMA = vol.Schema(
     }
 )
 
+CONF_SUBNET = "subnet"
+CONF_DEVICE = "device"
 
-async def _validate_connection(host: str, port: int) -> bool:
-    matrix = AsyncHDMIMatrix(host, port)
 
-    # Using async context manager
-    async with matrix:
-        # Power on the device during initial setup
-        _LOGGER.debug("Powering on device during setup")
-        await matrix.power_on()
+def _options_schema(options: dict[str, Any]) -> vol.Schema:
+    """Return the options schema, defaulting to the current options."""
+    interval = vol.All(vol.Coerce(int), vol.Range(min=5, max=3600))
+    return vol.Schema(
+        {
+            vol.Required(
+                CONF_SCAN_INTERVAL,
+                default=options.get(
+                    CONF_SCAN_INTERVAL, int(SCAN_INTERVAL.total_seconds())
+                ),
+            ): interval,
+            vol.Required(
+                CONF_POWER_INTERVAL,
+                default=options.get(CONF_POWER_INTERVAL, DEFAULT_POWER_INTERVAL),
+            ): interval,
+            vol.Required(
+                CONF_OUTPUT_POWER_INTERVAL,
+                default=options.get(
+                    CONF_OUTPUT_POWER_INTERVAL, DEFAULT_OUTPUT_POWER_INTERVAL
+                ),
+            ): interval,
+            vol.Required(
+                CONF_FAST_START,
+                default=options.get(CONF_FAST_START, DEFAULT_FAST_START),
+            ): bool,
+            vol.Required(
+                CONF_OPTIMISTIC_ROUTING,
+                default=options.get(
+                    CONF_OPTIMISTIC_ROUTING, DEFAULT_OPTIMISTIC_ROUTING
+                ),
+            ): bool,
+            vol.Required(
+                CONF_CONNECT_TIMEOUT,
+                default=options.get(CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT),
+            ): vol.All(vol.Coerce(int), vol.Range(min=2, max=60)),
+            vol.Required(
+                CONF_QUERY_TIMEOUT,
+                default=options.get(CONF_QUERY_TIMEOUT, DEFAULT_QUERY_TIMEOUT),
+            ): vol.All(vol.Coerce(int), vol.Range(min=3, max=60)),
+            vol.Required(
+                CONF_POLL_TIMEOUT,
+                default=options.get(CONF_POLL_TIMEOUT, DEFAULT_POLL_TIMEOUT),
+            ): vol.All(vol.Coerce(int), vol.Range(min=5, max=300)),
+        }
+    )
 
-        # Wait 2 seconds to ensure device is fully available
-        await asyncio.sleep(2)
 
-        name = await matrix.get_device_name()
-        _LOGGER.debug("Device found: %s", name)
-        return bool(name)
+async def _validate_connection(host: str, port: int) -> bool:
+    # The same quick name and type exchange discovery uses
+    matrix = await async_identify(host, port, DEFAULT_CONNECT_TIMEOUT)
+    _LOGGER.debug("Device found: %s", matrix)
+    return matrix is not None
+
+
+def _discovery_schema(subnet: str | None, port: int) -> vol.Schema:
+    """Return the schema of the subnet scan form."""
+    return vol.Schema(
+        {
+            vol.Required(CONF_SUBNET, default=subnet or vol.UNDEFINED): str,
+            vol.Required(CONF_PORT, default=port): int,
+        }
+    )
 
 
 class AVGearMatrixConfigFlow(ConfigFlow, domain=DOMAIN):
@@ -49,6 +123,16 @@ class AVGearMatrixConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        """Initialize the config flow."""
+        self._discovered: dict[str, DiscoveredMatrix] = {}
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Get the options flow for this handler."""
+        return AVGearMatrixOptionsFlow()
+
     @callback
     def _async_get_entry(self, data: dict[str, Any]) -> ConfigFlowResult:
         _LOGGER.debug("_async_get_entry")
@@ -64,8 +148,77 @@ class AVGearMatrixConfigFlow(ConfigFlow, domain=DOMAIN):
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
         """Handle a flow initialized by the user."""
+        return self.async_show_menu(step_id="user", menu_options=["discover", "manual"])
+
+    async def async_step_discover(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Scan a subnet for matrices."""
+        errors = {}
+        if user_input is not None:
+            try:
+                subnet = ipaddress.ip_network(user_input[CONF_SUBNET], strict=False)
+            except ValueError:
+                errors[CONF_SUBNET] = "invalid_subnet"
+            else:
+                if subnet.num_addresses > DISCOVERY_MAX_HOSTS:
+                    errors[CONF_SUBNET] = "subnet_too_large"
+            if not errors:
+                configured = self._async_current_ids(include_ignore=False)
+                self._discovered = {
+                    unique_id: matrix
+                    for matrix in await async_discover(
+                        [str(host) for host in subnet.hosts()], user_input[CONF_PORT]
+                    )
+                    if (unique_id := f"{matrix.host}:{matrix.port}") not in configured
+                }
+                if self._discovered:
+                    return await self.async_step_pick()
+                errors["base"] = "no_devices_found"
+            schema = _discovery_schema(user_input[CONF_SUBNET], user_input[CONF_PORT])
+        else:
+            # Suggest the /24 Home Assistant itself is on
+            source_ip = await network.async_get_source_ip(self.hass)
+            schema = _discovery_schema(
+                str(ipaddress.ip_network(f"{source_ip}/24", strict=False)),
+                DEFAULT_PORT,
+            )
+
+        return self.async_show_form(
+            step_id="discover", data_schema=schema, errors=errors
+        )
+
+    async def async_step_pick(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Let the user pick one of the discovered matrices."""
+        if user_input is None:
+            return self.async_show_form(
+                step_id="pick",
+                data_schema=vol.Schema(
+                    {
+                        vol.Required(CONF_DEVICE): vol.In(
+                            {
+                                unique_id: f"{matrix.name} ({matrix.device_type}) "
+                                f"at {matrix.host}:{matrix.port}"
+                                for unique_id, matrix in self._discovered.items()
+                            }
+                        )
+                    }
+                ),
+            )
+
+        matrix = self._discovered[user_input[CONF_DEVICE]]
+        await self.async_set_unique_id(user_input[CONF_DEVICE])
+        self._abort_if_unique_id_configured()
+        return self._async_get_entry({CONF_HOST: matrix.host, CONF_PORT: matrix.port})
+
+    async def async_step_manual(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Handle connection details entered by hand."""
         if user_input is None:
-            return self.async_show_form(step_id="user", data_schema=DATA_SCHEMA)
+            return self.async_show_form(step_id="manual", data_schema=DATA_SCHEMA)
 
         errors = {}
 
@@ -84,8 +237,28 @@ class AVGearMatrixConfigFlow(ConfigFlow, domain=DOMAIN):
 
         if errors:
             return self.async_show_form(
-                step_id="user", data_schema=DATA_SCHEMA, errors=errors
+                step_id="manual", data_schema=DATA_SCHEMA, errors=errors
             )
 
         _LOGGER.debug("No errors")
         return self._async_get_entry(user_input)
+
+
+class AVGearMatrixOptionsFlow(OptionsFlow):
+    """Handle AVGear Matrix options.
+
+    Poll intervals, timeouts and optimistic routing are read whenever they
+    are used and fast start on the next startup, so changes apply without
+    reloading the entry.
+    """
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the polling intervals, timeouts and startup behaviour."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        return self.async_show_form(
+            step_id="init", data_schema=_options_schema(self.config_entry.options)
+        )
@@ -3,9 +3,86 @@
 from datetime import timedelta
 
 DOMAIN = "avgear_matrix"
+
+# Not in homeassistant.const before 2025.9
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+
 MANUFACTURER = "AVGear"
 DEVICE_NAME = "AVGear Matrix"
 
 SCAN_INTERVAL = timedelta(seconds=30)
+# Adaptive polling: fast right after activity, backing off while stable
+FAST_SCAN_INTERVAL = timedelta(seconds=5)
+MAX_SCAN_INTERVAL = timedelta(minutes=2)
+ACTIVITY_WINDOW = 60  # seconds of fast polling after a command or change
+POLL_TOLERANCE = 1  # seconds early a data class may be fetched
+POLL_MAX_WAIT = 10  # seconds a poll step may be held back by commands
+
+# Data classes fetched by polls, each on its own interval
+DATA_ROUTING = "routing"
+DATA_POWER = "power"
+DATA_OUTPUT_POWER = "output_power"
+
+# Listener contexts for entities not tied to an output; per-output entities
+# use (DATA_ROUTING, output) and (DATA_OUTPUT_POWER, output)
+CONTEXT_DEVICE_INFO = "device_info"
+CONTEXT_POWER = "power"
+CONTEXT_HDBT_POWER = "hdbt_power"
+CONTEXT_ALL_OUTPUTS_POWER = "all_outputs_power"
+CONTEXT_STATS = "stats"
+
+EVENT_STATE_CHANGED = f"{DOMAIN}_state_changed"
+
+CONF_POWER_INTERVAL = "power_interval"
+CONF_OUTPUT_POWER_INTERVAL = "output_power_interval"
+DEFAULT_POWER_INTERVAL = 300  # seconds
+DEFAULT_OUTPUT_POWER_INTERVAL = 300  # seconds
+
+DEFAULT_PORT = 4001
+
+STORAGE_VERSION = 1
+STATE_SAVE_DELAY = 60  # seconds to batch writes of the last known state
+
+CONF_FAST_START = "fast_start"
+DEFAULT_FAST_START = True
+ATTR_RESTORED = "restored"
+
+CONF_OPTIMISTIC_ROUTING = "optimistic_routing"
+DEFAULT_OPTIMISTIC_ROUTING = False
+READBACK_DELAY = 1.0  # seconds to gather optimistic routes before reading back
+
+# Circuit breaker for unreachable matrices
+CIRCUIT_FAILURE_THRESHOLD = 3  # consecutive failures before giving up
+CIRCUIT_MIN_BACKOFF = 30  # seconds until the first probe
+CIRCUIT_MAX_BACKOFF = 600  # seconds between probes at most
+
+# Persistent session
+SESSION_IDLE_TIMEOUT = 300  # seconds without traffic before the socket is closed
+KEEPALIVE_IDLE = 60
+KEEPALIVE_INTERVAL = 10
+KEEPALIVE_COUNT = 3
+# Operations in flight at once across all matrices, to flatten load spikes
+MAX_CONCURRENT_SESSIONS = 4
+DATA_SESSION_SEMAPHORE = f"{DOMAIN}_session_semaphore"
+
+REPLY_TIMEOUT = 2.0  # seconds to wait for the first reply byte
+REPLY_IDLE_TIMEOUT = 0.5  # a reply is complete after this much silence
+
+# Deadlines, the library alone waits 1s for a welcome banner on connect
+CONF_CONNECT_TIMEOUT = "connect_timeout"
+CONF_QUERY_TIMEOUT = "query_timeout"
+CONF_POLL_TIMEOUT = "poll_timeout"
+DEFAULT_CONNECT_TIMEOUT = 5  # seconds
+DEFAULT_QUERY_TIMEOUT = 5  # seconds per exchange or library query
+DEFAULT_POLL_TIMEOUT = 30  # seconds for a whole poll, waiting included
+PROBE_TIMEOUT = 15  # seconds for the first probe, which powers the device on
+
+# Discovery and config flow validation
+DISCOVERY_CONCURRENCY = 64  # hosts probed at once
+DISCOVERY_CONNECT_TIMEOUT = 0.5  # seconds, a host on the LAN answers far sooner
+DISCOVERY_MAX_HOSTS = 1024  # largest subnet a scan accepts, a /22
+IDENTIFY_TIMEOUT = 1.0  # seconds for the name and type replies
+IDENTIFY_IDLE_TIMEOUT = 0.1  # the replies are complete after this much silence
 
-DEFAULT_PORT = 4001
\ No newline at end of file
+# Wire-level trace of exchanges, off unless started with the start_trace action
+TRACE_BUFFER_SIZE = 500  # most recent exchanges kept
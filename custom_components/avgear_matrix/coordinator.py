@@ -3,9 +3,15 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Sequence
+from dataclasses import dataclass, field
+from datetime import timedelta
 import ipaddress
 import logging
 from importlib.metadata import version as pkg_version
+from time import monotonic
+from typing import Any, TypeVar
+import zlib
 
 _CROCKFORD_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
 
@@ -21,21 +27,198 @@ def _crockford32_encode(n: int) -> str:
     return "".join(reversed(result))
 
 from hdmimatrix import AsyncHDMIMatrix
+from hdmimatrix.hdmimatrix import Commands
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_SCAN_INTERVAL
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .const import DEVICE_NAME, DOMAIN, MANUFACTURER, SCAN_INTERVAL
+from .breaker import CircuitBreaker
+from .const import (
+    ACTIVITY_WINDOW,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_MAX_BACKOFF,
+    CIRCUIT_MIN_BACKOFF,
+    CONF_OUTPUT_POWER_INTERVAL,
+    CONF_POLL_TIMEOUT,
+    CONF_POWER_INTERVAL,
+    CONTEXT_ALL_OUTPUTS_POWER,
+    CONTEXT_DEVICE_INFO,
+    CONTEXT_HDBT_POWER,
+    CONTEXT_POWER,
+    CONTEXT_STATS,
+    DATA_OUTPUT_POWER,
+    DATA_POWER,
+    DATA_ROUTING,
+    DEFAULT_OUTPUT_POWER_INTERVAL,
+    DEFAULT_POLL_TIMEOUT,
+    DEFAULT_POWER_INTERVAL,
+    DEVICE_NAME,
+    DOMAIN,
+    EVENT_STATE_CHANGED,
+    FAST_SCAN_INTERVAL,
+    MANUFACTURER,
+    MAX_SCAN_INTERVAL,
+    POLL_MAX_WAIT,
+    POLL_TOLERANCE,
+    READBACK_DELAY,
+    SCAN_INTERVAL,
+    STATE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from .scheduler import PRIORITY_COMMAND, PRIORITY_POLL, PriorityLock
+from .session import AVGearMatrixSession
+from .state import MatrixState
+from .stats import AVGearMatrixStats
+from .trace import TraceRecorder
 
 _LOGGER = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
+
+def _request(command: Commands, *args: int) -> bytes:
+    """Encode a protocol command, filling in any port numbers."""
+    return command.value.format(*args).encode("ascii")
+
+
+# Main power only, used while the matrix is off
+POWER_REQUESTS = (_request(Commands.NAME),)
+
+# The data classes a poll can fetch and the requests that fetch each of them,
+# pipelined into a single round trip
+DATA_CLASS_REQUESTS: dict[str, tuple[bytes, ...]] = {
+    DATA_ROUTING: (_request(Commands.STATUS_VIDEO),),
+    DATA_POWER: (_request(Commands.STATUS_PHDBT), _request(Commands.NAME)),
+    DATA_OUTPUT_POWER: (_request(Commands.STATUS_OUTPUT_POWER),),
+}
+
+
+def parse_hdbt_power_status(response: str) -> bool:
+    """Return the HdBT power state from a reply that may hold other answers."""
+    return any(
+        "ON!" in line for line in response.splitlines() if "Output" not in line
+    )
+
+
+@dataclass
+class _PendingCommands:
+    """Latest requested state not yet sent to the device."""
+
+    power: bool | None = None
+    hdbt_power: bool | None = None
+    output_power: dict[int, bool] = field(default_factory=dict)
+    routes: dict[int, int] = field(default_factory=dict)
+
+    def kinds(self) -> str:
+        """Return what kinds of command are pending, for statistics."""
+        return "+".join(
+            kind
+            for kind, pending in (
+                ("power", self.power is not None),
+                ("hdbt_power", self.hdbt_power is not None),
+                ("output_power", self.output_power),
+                ("routes", self.routes),
+            )
+            if pending
+        )
+
+    def requests(self, state: MatrixState) -> list[bytes]:
+        """Return the protocol requests that reach this state, in order."""
+        requests: list[bytes] = []
+        if self.power:
+            requests.append(_request(Commands.POWERON))
+        if self.hdbt_power is not None:
+            requests.append(
+                _request(
+                    Commands.HDBT_POWER_ON if self.hdbt_power else Commands.HDBT_POWER_OFF
+                )
+            )
+        for output_num, on in self.output_power.items():
+            if on and output_num in self.routes and state.output_power(output_num):
+                # Already on, the route alone is enough
+                continue
+            requests.append(
+                _request(Commands.OUTPUT_ON if on else Commands.OUTPUT_OFF, output_num)
+            )
+        for output_num, input_num in self.routes.items():
+            requests.append(_request(Commands.ROUTE_OUTPUT, output_num, input_num))
+        if self.power is False:
+            requests.append(_request(Commands.POWEROFF))
+        return requests
+
+
+@dataclass
+class _OptimisticRoute:
+    """A route shown before the device confirmed it, and what it replaced."""
+
+    input_num: int
+    previous_input: int | None
+    previous_power: bool | None
+
+
+def _ports_to_int(state: dict[str, Any]) -> dict[str, Any]:
+    """Turn the port numbers JSON made strings of back into ints."""
+    return {
+        key: {int(port): value for port, value in value.items()}
+        if key in ("routes", "output_power")
+        else value
+        for key, value in state.items()
+    }
+
+
+def _state_contexts(num_outputs: int) -> set[Hashable]:
+    """Return the listener contexts of every routing and power entity."""
+    return {
+        CONTEXT_POWER,
+        CONTEXT_HDBT_POWER,
+        CONTEXT_ALL_OUTPUTS_POWER,
+        *((DATA_ROUTING, output_num) for output_num in range(1, num_outputs + 1)),
+        *((DATA_OUTPUT_POWER, output_num) for output_num in range(1, num_outputs + 1)),
+    }
+
+
+def _changed_state_contexts(
+    old: MatrixState, new: MatrixState, num_outputs: int
+) -> set[Hashable]:
+    """Return the listener contexts whose value differs between two states."""
+    changed: set[Hashable] = set()
+    if old.power != new.power:
+        changed.add(CONTEXT_POWER)
+    if old.hdbt_power != new.hdbt_power:
+        changed.add(CONTEXT_HDBT_POWER)
+    if old.routes != new.routes:
+        changed.update(
+            (DATA_ROUTING, output_num)
+            for output_num in range(1, num_outputs + 1)
+            if old.route(output_num) != new.route(output_num)
+        )
+    if power_diff := (old.output_power_known ^ new.output_power_known) | (
+        old.output_power_on ^ new.output_power_on
+    ):
+        changed.update(
+            (DATA_OUTPUT_POWER, output_num)
+            for output_num in range(1, num_outputs + 1)
+            if power_diff & 1 << (output_num - 1)
+        )
+        changed.add(CONTEXT_ALL_OUTPUTS_POWER)
+    return changed
+
+
+def device_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the store caching a config entry's static device info."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+
 
 type AVGearMatrixConfigEntry = ConfigEntry[AVGearMatrixDataUpdateCoordinator]
 
 
-class AVGearMatrixDataUpdateCoordinator(DataUpdateCoordinator[dict[str, str]]):
+class AVGearMatrixDataUpdateCoordinator(DataUpdateCoordinator[MatrixState]):
     """Class to manage fetching AVGear data."""
 
     def __init__(
@@ -48,6 +231,9 @@ class AVGearMatrixDataUpdateCoordinator(DataUpdateCoordinator[dict[str, str]]):
     ) -> None:
         """Initialize global AVGear data updater."""
         self.matrix = matrix
+        self.stats = AVGearMatrixStats()
+        self.session = AVGearMatrixSession(hass, entry, matrix, self.stats)
+        self.trace = TraceRecorder()
 
         _LOGGER.debug("Init coordinator")
 
@@ -56,7 +242,11 @@ class AVGearMatrixDataUpdateCoordinator(DataUpdateCoordinator[dict[str, str]]):
             _LOGGER,
             config_entry=entry,
             name=DOMAIN,
-            update_interval=SCAN_INTERVAL,
+            update_interval=timedelta(
+                seconds=entry.options.get(
+                    CONF_SCAN_INTERVAL, SCAN_INTERVAL.total_seconds()
+                )
+            ),
         )
 
         _LOGGER.debug("CONF_HOST: %s", host)
@@ -66,155 +256,705 @@ class AVGearMatrixDataUpdateCoordinator(DataUpdateCoordinator[dict[str, str]]):
         _host_int = int(ipaddress.ip_address(host))
         self.short_id = _crockford32_encode((_host_int << 16) | port)
         self.device_id = f"avgear_matrix_{self.short_id}"
+        # Fraction of an interval the first scheduled poll is pushed back by
+        self._poll_phase: float | None = zlib.crc32(self.short_id.encode()) / 2**32
         self.device_info = None
+        self._ha_device_info: DeviceInfo | None = None
         self.num_inputs: int = 4
         self.num_outputs: int = 4
-        self.is_powered_on: bool | None = None
-        self.is_hdbt_powered_on: bool | None = None
-        self.output_power_status: dict[int, bool] = {}
-        self._lock = asyncio.Lock()
+        # Swapped for a new snapshot on every change, never modified in place
+        self.data = MatrixState()
+        self._lock = PriorityLock(POLL_MAX_WAIT, self.stats)
+        self.breaker = CircuitBreaker(
+            CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_MIN_BACKOFF, CIRCUIT_MAX_BACKOFF
+        )
+        self._pending_batch: asyncio.Future[bool] | None = None
+        self._pending = _PendingCommands()
+        self._last_activity = -ACTIVITY_WINDOW
+        self._stable_polls = 0
+        self._last_fetched: dict[str, float] = {}
+        self._store = device_store(hass, entry.entry_id)
+        # True while the state is the one cached by the previous run
+        self.restored = False
+        # Routes shown before being sent, and sent ones awaiting a read-back
+        self._optimistic: dict[int, _OptimisticRoute] = {}
+        self._unconfirmed: dict[int, _OptimisticRoute] = {}
+        self._readback = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=READBACK_DELAY,
+            immediate=False,
+            function=self._async_confirm_routes,
+        )
+        # Routing and output power to bring back after a power cycle, following
+        # commands and front-panel changes seen while the matrix stays up
+        self.desired_routes: dict[int, int] = {}
+        self.desired_output_power: dict[int, bool] = {}
+        # Set while the matrix is off or after it was unreachable long enough
+        # to open the circuit, it may come back reset. A single failed poll is
+        # not enough, the routing it missed may be a front-panel change.
+        self._reconcile_due = False
+        # Named routing and output power states saved by the snapshot action
+        self.snapshots: dict[str, dict[str, dict[int, Any]]] = {}
+        # Common values, per-context values and state listeners last saw
+        self._notified: tuple[tuple, dict[Hashable, Any], MatrixState] | None = None
 
-    async def _async_update_data(self) -> dict[str, str]:
+    async def _async_update_data(self) -> MatrixState:
         """Fetch data from AVGear Matrix."""
         _LOGGER.debug("_async_update_data coordinator")
 
+        if not self.breaker.closed:
+            if not self.breaker.probe_due():
+                self.stats.breaker_skips += 1
+                raise UpdateFailed(
+                    f"{self.host} is unreachable, retrying in "
+                    f"{self.breaker.retry_in:.0f}s"
+                )
+            _LOGGER.debug("Probing unreachable matrix %s", self.host)
+            # If it answers, catch up on everything missed while it was gone
+            self._last_fetched.clear()
+
+        start = monotonic()
+        poll_timeout = self.config_entry.options.get(
+            CONF_POLL_TIMEOUT, DEFAULT_POLL_TIMEOUT
+        )
         try:
-            async with self._lock, self.matrix:
-                video_status = await self.matrix.get_video_status_parsed()
-                _LOGGER.debug("Video Status: %s", video_status)
-                self.is_powered_on = await self.matrix.is_powered_on()
-                _LOGGER.debug("Is powered on: %s", self.is_powered_on)
-                self.is_hdbt_powered_on = await self.matrix.is_hdbt_powered_on()
-                _LOGGER.debug("Is HdBT powered on: %s", self.is_hdbt_powered_on)
-                self.output_power_status = await self.matrix.get_output_power_status_parsed()
-                _LOGGER.debug("Output power status: %s", self.output_power_status)
-                return video_status
+            async with asyncio.timeout(poll_timeout):
+                return await self._async_poll()
+        except TimeoutError as error:
+            # Cancelled wherever it was stuck, the session resets itself
+            self.stats.timeouts += 1
+            self.stats.update_failures += 1
+            raise UpdateFailed(f"Poll took longer than {poll_timeout}s") from error
         except OSError as error:
+            self.stats.update_failures += 1
             raise UpdateFailed from error
+        finally:
+            self.stats.last_poll_duration = monotonic() - start
+
+    async def _async_poll(self) -> MatrixState:
+        """Fetch whatever is due and return the new state."""
+        if self.data.power is False:
+            # Nothing but main power can change while the matrix is off
+            async with self._lock.acquire(PRIORITY_POLL):
+                response = await self._async_exchange(
+                    "poll main_power", POWER_REQUESTS, expect_reply=False
+                )
+                trace = self.trace.last if self.trace.active else None
+                powered_on = await self._async_parse_powered_on(response)
+                if trace is not None:
+                    trace.parsed = monotonic()
+            if not powered_on:
+                _LOGGER.debug("Still powered off")
+                self._reconcile_due = True
+                self.restored = False
+                self._async_adapt_update_interval(changed=False)
+                return self.data
+            _LOGGER.debug("Powered on externally")
+            self._last_fetched.clear()
+        elif self._reconcile_due:
+            # Compare against everything the matrix reports now
+            self._last_fetched.clear()
+
+        previous = self.data
+        due = self._due_data_classes()
+        _LOGGER.debug("Fetching %s", due)
+        video_status = await self._async_fetch(due)
+
+        if not self.data.power:
+            # An off matrix reports no routing, the last known one is kept
+            self._reconcile_due = True
+        elif video_status and self._reconcile_due:
+            self._reconcile_due = False
+            await self._async_reconcile()
+        elif video_status:
+            self.desired_routes.update(self.data.routes_dict())
+            self.desired_output_power.update(self.data.output_power_dict())
+        self.restored = False
+        self._async_save_state()
+        # The first poll of a fresh start is not a change
+        self._async_adapt_update_interval(
+            changed=bool(previous.version) and self.data is not previous
+        )
+        return self.data
+
+    async def _async_reconcile(self) -> None:
+        """Push the desired state back to a matrix that came back from off.
+
+        Power cycles and resets leave the routing at the firmware defaults.
+        Only the routes and output power states that drifted are sent, in a
+        single batch.
+        """
+        state = self.data
+        routes = {
+            output_num: input_num
+            for output_num, input_num in self.desired_routes.items()
+            if state.route(output_num) != input_num
+        }
+        output_power = {
+            output_num: on
+            for output_num, on in self.desired_output_power.items()
+            if state.output_power(output_num) != on
+        }
+        if not routes and not output_power:
+            return
+        _LOGGER.info(
+            "%s came back with different routing, re-applying routes %s "
+            "and output power %s",
+            self.host,
+            routes,
+            output_power,
+        )
+        self._pending.routes.update(routes)
+        self._pending.output_power.update(output_power)
+        await self._async_queue_commands()
+
+    async def async_refresh_data(self, *data_classes: str) -> None:
+        """Refresh only the given data classes instead of running a full poll.
+
+        Used after commands, whose effect is limited to one data class.
+        """
+        if not self.breaker.closed:
+            return
+        _LOGGER.debug("Refreshing %s", data_classes)
+        try:
+            await self._async_fetch(list(data_classes))
+        except OSError as err:
+            _LOGGER.warning("Failed to refresh %s: %s", data_classes, err)
+            return
+        self._async_save_state()
+        self.async_update_listeners()
+
+    async def _async_fetch(self, data_classes: list[str]) -> dict[int, int] | None:
+        """Fetch the given data classes in one exchange and apply them.
+
+        Each exchange is a separate step at poll priority, so commands queued
+        meanwhile go first. Returns the routing if it was fetched.
+        """
+        async with self._lock.acquire(PRIORITY_POLL):
+            response = await self._async_exchange(
+                f"poll {'+'.join(data_classes)}",
+                [
+                    request
+                    for data_class in data_classes
+                    for request in DATA_CLASS_REQUESTS[data_class]
+                ]
+            )
+            trace = self.trace.last if self.trace.active else None
+            video_status = await self._async_apply_fetched(data_classes, response)
+            if trace is not None:
+                trace.parsed = monotonic()
+        if (
+            DATA_ROUTING in data_classes
+            and DATA_POWER not in data_classes
+            and not video_status
+        ):
+            # Silence usually means the matrix was switched off
+            async with self._lock.acquire(PRIORITY_POLL):
+                response = await self._async_exchange(
+                    f"poll {DATA_POWER}",
+                    DATA_CLASS_REQUESTS[DATA_POWER],
+                    expect_reply=False,
+                )
+                trace = self.trace.last if self.trace.active else None
+                await self._async_apply_fetched([DATA_POWER], response)
+                if trace is not None:
+                    trace.parsed = monotonic()
+        return video_status
+
+    async def _async_exchange(
+        self, operation: str, requests: Sequence[bytes], *, expect_reply: bool = True
+    ) -> str:
+        """Exchange requests with the matrix, recording the latency.
+
+        Must be called with the lock held. A matrix that is off stays silent,
+        so an empty reply only counts as a timeout if expect_reply is set and
+        the matrix is not known to be off. Such a timeout is a failure and
+        drops the connection, which may be half-open to a matrix that lost
+        power, so the next exchange finds out whether it is still reachable.
+        """
+        trace = (
+            self.trace.begin(operation, self._lock.last_wait)
+            if self.trace.active
+            else None
+        )
+        start = monotonic()
+        try:
+            response = await self.session.async_exchange(requests, trace)
+        except OSError as err:
+            if trace is not None:
+                trace.error = str(err)
+            self._async_record_failure()
+            raise
+        self.stats.latency[operation].record(monotonic() - start)
+        if response:
+            self._async_record_success()
+        elif expect_reply and self.data.power is not False:
+            _LOGGER.debug("No reply to %s, dropping the connection", operation)
+            self.stats.timeouts += 1
+            self._async_record_failure()
+            await self.session.async_close()
+        else:
+            self.stats.empty_replies += 1
+            self._async_record_success()
+        return response
+
+    async def _async_run(self, query: Callable[[AsyncHDMIMatrix], Awaitable[_T]]) -> _T:
+        """Run a library query against the matrix, recording the latency.
+
+        Must be called with the lock held.
+        """
+        trace = (
+            self.trace.begin(f"query {query.__name__}", self._lock.last_wait)
+            if self.trace.active
+            else None
+        )
+        start = monotonic()
+        try:
+            result = await self.session.async_run(query, trace=trace)
+        except OSError as err:
+            if trace is not None:
+                trace.error = str(err)
+            self._async_record_failure()
+            raise
+        if trace is not None:
+            trace.complete = monotonic()
+        self._async_record_success()
+        self.stats.latency[f"query {query.__name__}"].record(monotonic() - start)
+        return result
+
+    @callback
+    def _async_record_success(self) -> None:
+        if self.breaker.record_success():
+            _LOGGER.info("Matrix %s is reachable again", self.host)
+
+    @callback
+    def _async_record_failure(self) -> None:
+        was_closed = self.breaker.closed
+        self.breaker.record_failure()
+        if was_closed and not self.breaker.closed:
+            # Down for long enough that it may have been power cycled
+            self._reconcile_due = True
+            _LOGGER.warning(
+                "Matrix %s is unreachable, pausing connection attempts for %.0fs",
+                self.host,
+                self.breaker.retry_in,
+            )
+
+    async def _async_apply_fetched(
+        self, data_classes: list[str], response: str
+    ) -> dict[int, int] | None:
+        """Parse a status reply into a new state, return the routing if it has one.
+
+        Must be called with the lock held. An off matrix reports no routing,
+        so the last known one is kept.
+        """
+        video_status = None
+        changes: dict[str, Any] = {}
+        if DATA_ROUTING in data_classes:
+            video_status = self.matrix.parse_video_status(response)
+            _LOGGER.debug("Video Status: %s", video_status)
+            if video_status:
+                # Not sent yet, a reply from before must not undo them
+                for output_num, route in self._optimistic.items():
+                    video_status[output_num] = route.input_num
+                changes["routes"] = video_status
+        if DATA_POWER in data_classes:
+            changes["power"] = await self._async_parse_powered_on(response)
+            changes["hdbt_power"] = parse_hdbt_power_status(response)
+            _LOGGER.debug(
+                "Is powered on: %s, HdBT: %s", changes["power"], changes["hdbt_power"]
+            )
+        if DATA_OUTPUT_POWER in data_classes:
+            output_power = self.matrix.parse_output_power_status(response)
+            _LOGGER.debug("Output power status: %s", output_power)
+            for output_num in self._optimistic:
+                output_power[output_num] = True
+            changes["output_power"] = output_power
+        self.data = self.data.evolve(**changes)
+
+        now = monotonic()
+        for data_class in data_classes:
+            self._last_fetched[data_class] = now
+        return video_status
+
+    def _due_data_classes(self) -> list[str]:
+        """Return the data classes this poll should fetch.
+
+        Routing is fetched on every poll. Power and output power have their
+        own, usually much longer, intervals, except right after activity when
+        everything is refreshed so front-panel changes show up quickly.
+        """
+        now = monotonic()
+        if now - self._last_activity < ACTIVITY_WINDOW:
+            return list(DATA_CLASS_REQUESTS)
+        options = self.config_entry.options
+        intervals = {
+            DATA_ROUTING: 0,
+            DATA_POWER: options.get(CONF_POWER_INTERVAL, DEFAULT_POWER_INTERVAL),
+            DATA_OUTPUT_POWER: options.get(
+                CONF_OUTPUT_POWER_INTERVAL, DEFAULT_OUTPUT_POWER_INTERVAL
+            ),
+        }
+        return [
+            data_class
+            for data_class, interval in intervals.items()
+            if data_class not in self._last_fetched
+            # Polls are not exact, don't skip a class that is nearly due
+            or now - self._last_fetched[data_class] >= interval - POLL_TOLERANCE
+        ]
+
+    @property
+    def scan_interval(self) -> timedelta:
+        """Return the configured base poll interval."""
+        return timedelta(
+            seconds=self.config_entry.options.get(
+                CONF_SCAN_INTERVAL, SCAN_INTERVAL.total_seconds()
+            )
+        )
+
+    @callback
+    def _async_adapt_update_interval(self, changed: bool) -> None:
+        """Pick the next poll interval from recent activity.
+
+        Poll at FAST_SCAN_INTERVAL for ACTIVITY_WINDOW after a command or an
+        external change, then back off exponentially from the configured scan
+        interval up to MAX_SCAN_INTERVAL while nothing changes.
+        """
+        now = monotonic()
+        if changed:
+            _LOGGER.debug("External change detected")
+            self._last_activity = now
+        if now - self._last_activity < ACTIVITY_WINDOW:
+            self._stable_polls = 0
+            self.update_interval = FAST_SCAN_INTERVAL
+        else:
+            max_interval = max(self.scan_interval, MAX_SCAN_INTERVAL)
+            self.update_interval = min(
+                self.scan_interval * 2**self._stable_polls, max_interval
+            )
+            if self.update_interval < max_interval:
+                self._stable_polls += 1
+        if self._poll_phase is not None:
+            # Offset once, so matrices set up together do not poll in lockstep
+            self.update_interval *= 1 + self._poll_phase
+            self._poll_phase = None
+        _LOGGER.debug("Next poll in %s", self.update_interval)
+
+    @callback
+    def _async_note_activity(self) -> None:
+        """Switch to fast polling after a command."""
+        self._last_activity = monotonic()
+        self._stable_polls = 0
+        if self.update_interval != FAST_SCAN_INTERVAL:
+            self.update_interval = FAST_SCAN_INTERVAL
+            if self._unsub_refresh is not None:
+                # Bring the next poll forward instead of waiting out the old one
+                self._schedule_refresh()
+
+    async def _async_parse_powered_on(self, response: str) -> bool:
+        """Work out the main power state from a combined status reply.
+
+        The device only answers the name query while powered on, so the known
+        device name showing up in the reply means it is on. Until the name is
+        known fall back to a dedicated query.
+        """
+        name = (self.device_info or {}).get("model")
+        if name and name != "Unknown":
+            return name in response
+        return await self._async_run(AsyncHDMIMatrix.is_powered_on)
 
     async def async_power_on(self) -> bool:
         """Power on the matrix."""
-        try:
-            async with self._lock, self.matrix:
-                result = await self.matrix.power_on()
-                _LOGGER.debug("Power on result: %s", result)
-                if result:
-                    self.is_powered_on = True
-                return result
-        except Exception as err:
-            _LOGGER.error("Failed to power on matrix: %s", err)
-            return False
+        self._pending.power = True
+        return await self._async_queue_commands()
 
     async def async_power_off(self) -> bool:
         """Power off the matrix."""
-        try:
-            async with self._lock, self.matrix:
-                result = await self.matrix.power_off()
-                _LOGGER.debug("Power off result: %s", result)
-                if result:
-                    self.is_powered_on = False
-                return result
-        except Exception as err:
-            _LOGGER.error("Failed to power off matrix: %s", err)
-            return False
+        self._pending.power = False
+        return await self._async_queue_commands()
 
     async def async_hdbt_power_on(self) -> bool:
         """Power on HdBT."""
-        try:
-            async with self._lock, self.matrix:
-                result = await self.matrix.hdbt_power_on()
-                _LOGGER.debug("HdBT power on result: %s", result)
-                if result:
-                    self.is_hdbt_powered_on = True
-                return result
-        except Exception as err:
-            _LOGGER.error("Failed to power on HdBT: %s", err)
-            return False
+        self._pending.hdbt_power = True
+        return await self._async_queue_commands()
 
     async def async_hdbt_power_off(self) -> bool:
         """Power off HdBT."""
-        try:
-            async with self._lock, self.matrix:
-                result = await self.matrix.hdbt_power_off()
-                _LOGGER.debug("HdBT power off result: %s", result)
-                if result:
-                    self.is_hdbt_powered_on = False
-                return result
-        except Exception as err:
-            _LOGGER.error("Failed to power off HdBT: %s", err)
-            return False
+        self._pending.hdbt_power = False
+        return await self._async_queue_commands()
 
     async def async_output_on(self, output_num: int) -> bool:
         """Power on an individual output."""
-        try:
-            async with self._lock, self.matrix:
-                result = await self.matrix.output_on(output_num)
-                _LOGGER.debug("Output %s on result: %s", output_num, result)
-                if result:
-                    self.output_power_status[output_num] = await self.matrix.is_output_on(output_num)
-                return result
-        except Exception as err:
-            _LOGGER.error("Failed to power on output %s: %s", output_num, err)
-            return False
+        self._pending.output_power[output_num] = True
+        return await self._async_queue_commands()
 
     async def async_output_off(self, output_num: int) -> bool:
         """Power off an individual output."""
-        try:
-            async with self._lock, self.matrix:
-                result = await self.matrix.output_off(output_num)
-                _LOGGER.debug("Output %s off result: %s", output_num, result)
-                if result:
-                    self.output_power_status[output_num] = await self.matrix.is_output_on(output_num)
-                return result
-        except Exception as err:
-            _LOGGER.error("Failed to power off output %s: %s", output_num, err)
-            return False
+        self._pending.output_power[output_num] = False
+        return await self._async_queue_commands()
+
+    async def async_set_outputs_power(self, outputs: dict[int, bool]) -> bool:
+        """Power several outputs on or off in one batch.
+
+        Outputs already in the requested state are skipped; the rest are
+        sent back-to-back in a single exchange and read back with one
+        output power query.
+        """
+        changed = {
+            output_num: on
+            for output_num, on in outputs.items()
+            if self.data.output_power(output_num) is not on
+        }
+        _LOGGER.debug("Setting output power %s, changed: %s", outputs, changed)
+        if not changed:
+            return True
+
+        self._pending.output_power.update(changed)
+        result = await self._async_queue_commands()
+        if result:
+            await self.async_refresh_data(DATA_OUTPUT_POWER)
+        return result
 
     async def async_route_input_to_output(
         self, input_num: int, output_num: int
     ) -> bool:
         """Route input to output."""
+        # Routing to an output also turns it on
+        self._pending.output_power[output_num] = True
+        self._pending.routes[output_num] = input_num
+        return await self._async_queue_commands()
+
+    @callback
+    def async_route_optimistically(self, input_num: int, output_num: int) -> None:
+        """Show a route straight away and send it in the background.
+
+        Once sent, the routing is read back shortly after; if the device
+        disagrees, or the command failed, the output goes back to what the
+        device actually reports.
+        """
+        previous = self._optimistic.get(output_num)
+        route = _OptimisticRoute(
+            input_num,
+            previous.previous_input if previous else self.data.route(output_num),
+            previous.previous_power
+            if previous
+            else self.data.output_power(output_num),
+        )
+        self._optimistic[output_num] = route
+        self.data = self.data.evolve(
+            routes={output_num: input_num}, output_power={output_num: True}
+        )
+        self.async_update_listeners()
+        self.config_entry.async_create_background_task(
+            self.hass,
+            self._async_send_optimistic_route(output_num, route),
+            f"{DOMAIN} {self.short_id} route output {output_num}",
+        )
+
+    async def _async_send_optimistic_route(
+        self, output_num: int, route: _OptimisticRoute
+    ) -> None:
+        """Send an optimistic route, roll it back if that fails."""
+        result = await self.async_route_input_to_output(route.input_num, output_num)
+        if self._optimistic.get(output_num) is not route:
+            # Superseded by a newer selection, which settles the output
+            return
+        del self._optimistic[output_num]
+        if result:
+            self._unconfirmed[output_num] = route
+            await self._readback.async_call()
+            return
+
+        _LOGGER.warning(
+            "Failed to route input %s to output %s on %s, rolling back",
+            route.input_num,
+            output_num,
+            self.host,
+        )
+        self.data = self.data.evolve(
+            routes={output_num: route.previous_input},
+            output_power={output_num: route.previous_power},
+        )
+        self.async_update_listeners()
+
+    async def _async_confirm_routes(self) -> None:
+        """Read the routing back and report sent routes the device dropped."""
+        routes, self._unconfirmed = self._unconfirmed, {}
+        if not routes:
+            return
+        await self.async_refresh_data(DATA_ROUTING)
+        state = self.data
+        for output_num, route in routes.items():
+            if output_num in self._optimistic or state.route(output_num) in (
+                None,
+                route.input_num,
+            ):
+                continue
+            # The read-back already put the device's own route in place
+            _LOGGER.warning(
+                "%s did not keep input %s on output %s, it reports input %s",
+                self.host,
+                route.input_num,
+                output_num,
+                state.route(output_num),
+            )
+
+    async def async_apply_routes(self, routes: dict[int, int]) -> bool:
+        """Apply a full output -> input mapping in one batch.
+
+        Outputs that are already powered and on the requested input are
+        skipped; everything else is sent back-to-back in a single exchange.
+        """
+        state = self.data
+        changed = {
+            output_num: input_num
+            for output_num, input_num in routes.items()
+            if state.route(output_num) != input_num
+            or not state.output_power(output_num)
+        }
+        _LOGGER.debug("Applying routes %s, changed: %s", routes, changed)
+        if not changed:
+            return True
+
+        for output_num, input_num in changed.items():
+            self._pending.output_power[output_num] = True
+            self._pending.routes[output_num] = input_num
+        result = await self._async_queue_commands()
+        if result:
+            await self.async_refresh_data(DATA_ROUTING)
+        return result
+
+    @callback
+    def async_snapshot(self, name: str) -> dict[str, dict[int, Any]]:
+        """Save the current routing and output power under a name."""
+        snapshot = {
+            "routes": self.data.routes_dict(),
+            "output_power": self.data.output_power_dict(),
+        }
+        self.snapshots[name] = snapshot
+        self._async_save_state()
+        return snapshot
+
+    async def async_restore(self, name: str) -> bool:
+        """Bring routing and output power back to a saved snapshot.
+
+        Only the routes and output power states that differ from the
+        snapshot are sent, in a single batch, so restoring an unchanged
+        matrix sends nothing at all.
+        """
+        snapshot = self.snapshots[name]
+        state = self.data
+        routes = {
+            output_num: input_num
+            for output_num, input_num in snapshot["routes"].items()
+            if state.route(output_num) != input_num
+        }
+        output_power = {
+            output_num: on
+            for output_num, on in snapshot["output_power"].items()
+            if state.output_power(output_num) != on
+        }
+        _LOGGER.debug("Restoring %s: routes %s, power %s", name, routes, output_power)
+        if not routes and not output_power:
+            return True
+
+        self._pending.routes.update(routes)
+        self._pending.output_power.update(output_power)
+        result = await self._async_queue_commands()
+        if result and routes:
+            await self.async_refresh_data(DATA_ROUTING)
+        return result
+
+    async def _async_queue_commands(self) -> bool:
+        """Wait for the pending commands to be sent to the device.
+
+        Commands queued while an earlier batch is still waiting for the
+        device are merged into it, a newer state for the same output (or
+        for main and HdBT power) replacing the older one, so only the last
+        intended state is ever sent. While the matrix is unreachable commands
+        fail straight away instead of queueing behind doomed connects.
+        """
+        if not self.breaker.closed and self._pending_batch is None:
+            _LOGGER.debug("Matrix %s is unreachable, dropping commands", self.host)
+            self._pending = _PendingCommands()
+            return False
+        if (batch := self._pending_batch) is None:
+            batch = self._pending_batch = self.hass.loop.create_future()
+            self.config_entry.async_create_background_task(
+                self.hass,
+                self._async_send_pending_commands(batch),
+                f"{DOMAIN} {self.short_id} commands",
+            )
+        return await asyncio.shield(batch)
+
+    async def _async_send_pending_commands(self, batch: asyncio.Future[bool]) -> None:
+        """Send everything queued so far as one batch."""
         try:
-            async with self._lock, self.matrix:
-                # Ensure the output is powered on before routing
-                result = await self.matrix.output_on(output_num)
-                _LOGGER.debug("Turned on output %s: %s", output_num, result)
-
-                # Now route the input to the output
-                result = await self.matrix.route_input_to_output(input_num, output_num)
-                _LOGGER.debug(
-                    "Routed input %s to output %s: %s", input_num, output_num, result
+            async with self._lock.acquire(PRIORITY_COMMAND):
+                # Commands queued from here on go into the next batch
+                self._pending_batch = None
+                commands, self._pending = self._pending, _PendingCommands()
+                if not self.breaker.closed:
+                    # Became unreachable while this batch was waiting
+                    batch.set_result(False)
+                    return
+                requests = commands.requests(self.data)
+                _LOGGER.debug("Sending commands: %s", requests)
+                response = await self._async_exchange(
+                    f"command {commands.kinds()}", requests
                 )
-                # Update internal state immediately
-                self.update_output_state(output_num, input_num)
-                return result
+        except asyncio.CancelledError:
+            # Most likely the entry is unloading
+            if self._pending_batch is batch:
+                self._pending_batch = None
+            batch.cancel()
+            raise
         except Exception as err:
-            _LOGGER.error(
-                "Failed to route input %s to output %s: %s", input_num, output_num, err
-            )
-            return False
+            _LOGGER.error("Failed to send commands %s: %s", commands, err)
+            batch.set_result(False)
+            return
+
+        if not response:
+            # Not acknowledged, the device may not have taken any of it
+            _LOGGER.warning("No reply to commands %s", requests)
+            self._last_fetched.clear()
+            self._async_note_activity()
+            batch.set_result(False)
+            return
+
+        # Update internal state immediately
+        changes: dict[str, Any] = {}
+        if commands.power is not None:
+            if commands.power and not self.data.power:
+                self._reconcile_due = True
+            changes["power"] = commands.power
+        if commands.hdbt_power is not None:
+            changes["hdbt_power"] = commands.hdbt_power
+        self.data = self.data.evolve(
+            routes=commands.routes,
+            output_power={
+                **commands.output_power,
+                **self.matrix.parse_output_power_status(response),
+            },
+            **changes,
+        )
+        self.desired_routes.update(commands.routes)
+        self.desired_output_power.update(commands.output_power)
+        self._async_note_activity()
+        self._async_save_state()
+        self.async_update_listeners()
+        batch.set_result(True)
 
     async def async_get_device_info(self):
         """Get static device information once."""
         if self.device_info is None:
             try:
-                # Load static info from device
-                async with self._lock, self.matrix:
-                    name = await self.matrix.get_device_name()
-                    device_type = await self.matrix.get_device_type()
-                    version = await self.matrix.get_device_version()
-                    input_status = await self.matrix.get_input_status_parsed()
-
-                lib_version = await self.hass.async_add_executor_job(pkg_version, "hdmimatrix")
-                self.device_info = {
-                    "model": name,
-                    "type": device_type,
-                    "version": version,
-                    "lib_version": lib_version,
-                }
-                if input_status:
-                    self.num_inputs = len(input_status)
-                    self.num_outputs = len(input_status)
+                (
+                    self.device_info,
+                    self.num_inputs,
+                    self.num_outputs,
+                ) = await self._async_probe_device_info()
             except Exception as err:
                 _LOGGER.warning("Could not get device info: %s", err)
                 self.device_info = {
@@ -223,25 +963,243 @@ class AVGearMatrixDataUpdateCoordinator(DataUpdateCoordinator[dict[str, str]]):
                     "version": "Unknown",
                     "lib_version": "Unknown",
                 }
+            else:
+                await self._async_save_device_info()
         return self.device_info
 
+    async def async_load_cache(self, restore_state: bool = False) -> bool:
+        """Restore what an earlier start saved, return true if anything was.
+
+        Static device information, snapshots and the desired state are always
+        restored, the desired state to be re-applied wherever the first poll
+        disagrees with it. With restore_state the last known routing and power
+        state are restored as well and flagged as such until the first
+        refresh succeeds.
+        """
+        if not (cached := await self._store.async_load()):
+            return False
+        # The library may have been upgraded since the info was saved
+        lib_version = await self.hass.async_add_executor_job(pkg_version, "hdmimatrix")
+        self.device_info = {**cached["device_info"], "lib_version": lib_version}
+        self.num_inputs = cached["num_inputs"]
+        self.num_outputs = cached["num_outputs"]
+        _LOGGER.debug("Loaded cached device info: %s", self.device_info)
+        self.snapshots = {
+            name: _ports_to_int(snapshot)
+            for name, snapshot in cached.get("snapshots", {}).items()
+        }
+        if desired := cached.get("desired_state"):
+            desired = _ports_to_int(desired)
+            self.desired_routes = desired["routes"]
+            self.desired_output_power = desired["output_power"]
+            # The matrix may have been power cycled while nobody was watching
+            self._reconcile_due = True
+
+        if restore_state and (state := cached.get("state")):
+            state = _ports_to_int(state)
+            self.data = self.data.evolve(
+                routes=state["routes"],
+                output_power=state["output_power"],
+                power=state["power"],
+                hdbt_power=state["hdbt_power"],
+            )
+            self.restored = True
+            _LOGGER.debug("Restored last known state: %s", state)
+        return True
+
+    async def async_refresh_device_info(self) -> None:
+        """Re-probe the device and update the cached device information.
+
+        Entities are rebuilt if the number of inputs or outputs changed.
+        """
+        if not self.breaker.closed:
+            return
+        try:
+            device_info, num_inputs, num_outputs = await self._async_probe_device_info()
+        except Exception as err:
+            _LOGGER.debug("Could not refresh device info: %s", err)
+            return
+        if not device_info["model"]:
+            # Powered off, keep what we have
+            return
+        if (device_info, num_inputs, num_outputs) == (
+            self.device_info,
+            self.num_inputs,
+            self.num_outputs,
+        ):
+            return
+
+        _LOGGER.info(
+            "Device info changed from %s to %s", self.device_info, device_info
+        )
+        counts_changed = (num_inputs, num_outputs) != (self.num_inputs, self.num_outputs)
+        self.device_info = device_info
+        self.num_inputs = num_inputs
+        self.num_outputs = num_outputs
+        await self._async_save_device_info()
+        if counts_changed:
+            self.hass.config_entries.async_schedule_reload(self.config_entry.entry_id)
+        else:
+            self.async_update_listeners()
+
+    async def _async_probe_device_info(self) -> tuple[dict[str, str], int, int]:
+        """Load static info from device."""
+
+        # One step per query, the library waits out a quiet gap after each
+        results = []
+        for query in (
+            AsyncHDMIMatrix.get_device_name,
+            AsyncHDMIMatrix.get_device_type,
+            AsyncHDMIMatrix.get_device_version,
+            AsyncHDMIMatrix.get_input_status_parsed,
+        ):
+            async with self._lock.acquire(PRIORITY_POLL):
+                results.append(await self._async_run(query))
+        name, device_type, version, input_status = results
+
+        lib_version = await self.hass.async_add_executor_job(pkg_version, "hdmimatrix")
+        device_info = {
+            "model": name,
+            "type": device_type,
+            "version": version,
+            "lib_version": lib_version,
+        }
+        if not input_status:
+            return device_info, self.num_inputs, self.num_outputs
+        return device_info, len(input_status), len(input_status)
+
+    async def _async_save_device_info(self) -> None:
+        """Persist the static device information for the next start."""
+        await self._store.async_save(self._data_to_store())
+
+    @callback
+    def _async_save_state(self) -> None:
+        """Persist the current routing and power state, batching writes."""
+        self._store.async_delay_save(self._data_to_store, STATE_SAVE_DELAY)
+
+    @callback
+    def _data_to_store(self) -> dict[str, Any]:
+        """Return the data to cache for the next start."""
+        return {
+            "device_info": {
+                key: value
+                for key, value in (self.device_info or {}).items()
+                if key != "lib_version"
+            },
+            "num_inputs": self.num_inputs,
+            "num_outputs": self.num_outputs,
+            "state": {
+                "routes": self.data.routes_dict(),
+                "power": self.data.power,
+                "hdbt_power": self.data.hdbt_power,
+                "output_power": self.data.output_power_dict(),
+            },
+            "desired_state": {
+                "routes": self.desired_routes,
+                "output_power": self.desired_output_power,
+            },
+            "snapshots": self.snapshots,
+        }
+
+    async def async_close(self) -> None:
+        """Close the persistent session to the matrix."""
+        async with self._lock.acquire(PRIORITY_COMMAND):
+            await self.session.async_close()
+
+    async def async_shutdown(self) -> None:
+        """Cancel any scheduled refresh, save the state and close the session."""
+        await super().async_shutdown()
+        self._readback.async_shutdown()
+        if self.device_info is not None:
+            # Write the last known state now rather than after STATE_SAVE_DELAY
+            await self._store.async_save(self._data_to_store())
+        await self.async_close()
+
     @property
     def ha_device_info(self) -> DeviceInfo:
-        """Return HA DeviceInfo for this device."""
-        info = self.device_info or {}
-        return DeviceInfo(
-            identifiers={(DOMAIN, self.device_id)},
-            manufacturer=MANUFACTURER,
-            name=f"{DEVICE_NAME} {self.short_id}",
-            model=info.get("model"),
-            configuration_url=f"http://{self.host}",
-        )
-
-    def update_output_state(self, output_num: int, input_num: int) -> None:
-        """Update the internal state for a specific output immediately."""
-        if self.data is None:
-            self.data = {}
-        self.data[output_num] = input_num
-        _LOGGER.debug(
-            "Updated internal state: output %s -> input %s", output_num, input_num
+        """Return HA DeviceInfo for this device, one object for all entities."""
+        model = (self.device_info or {}).get("model")
+        if self._ha_device_info is None or self._ha_device_info.get("model") != model:
+            self._ha_device_info = DeviceInfo(
+                identifiers={(DOMAIN, self.device_id)},
+                manufacturer=MANUFACTURER,
+                name=f"{DEVICE_NAME} {self.short_id}",
+                model=model,
+                configuration_url=f"http://{self.host}",
+            )
+        return self._ha_device_info
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify only the listeners whose data changed since the last update.
+
+        Entities register with a context naming the data they show: one of
+        the CONTEXT_* constants or a (data class, output) pair. Listeners
+        without a context are always notified.
+        A change in availability, main power or the restored flag affects
+        every routing and power entity, but never the device info or
+        statistics ones.
+        Every new state snapshot also fires one state changed event with
+        what differs from the last one notified.
+        """
+        state = self.data
+        common = (self.last_update_success, state.power, self.restored)
+        values: dict[Hashable, Any] = {
+            CONTEXT_DEVICE_INFO: (
+                dict(self.device_info or {}),
+                self.num_inputs,
+                self.num_outputs,
+            ),
+            CONTEXT_STATS: (
+                self.stats.last_poll_duration,
+                self.stats.mean_latency("command"),
+                self.stats.update_failures,
+                self.stats.reconnects,
+                self.stats.timeouts,
+            ),
+        }
+
+        previous = self._notified
+        self._notified = (common, values, state)
+        if previous is None:
+            changed = None
+        else:
+            previous_common, previous_values, previous_state = previous
+            changed = {
+                context
+                for context, value in values.items()
+                if previous_values.get(context) != value
+            }
+            if previous_common != common:
+                changed.update(_state_contexts(self.num_outputs))
+            elif previous_state.version != state.version:
+                changed.update(
+                    _changed_state_contexts(previous_state, state, self.num_outputs)
+                )
+            if previous_state.version != state.version:
+                self._async_fire_state_changed(previous_state, state)
+        _LOGGER.debug("Changed: %s", "all" if changed is None else changed)
+
+        for update_callback, context in list(self._listeners.values()):
+            if changed is None or context is None or context in changed:
+                update_callback()
+
+    @callback
+    def _async_fire_state_changed(self, old: MatrixState, new: MatrixState) -> None:
+        """Fire one event carrying the routes and power that changed, if any."""
+        if not (changes := new.diff(old)):
+            return
+        # String keys, as the event is stored and sent as JSON
+        for key in ("routes", "output_power"):
+            if key in changes:
+                changes[key] = {
+                    str(port): value for port, value in changes[key].items()
+                }
+        self.hass.bus.async_fire(
+            EVENT_STATE_CHANGED,
+            {
+                "config_entry_id": self.config_entry.entry_id,
+                "timestamp": dt_util.utcnow().isoformat(),
+                **changes,
+            },
         )
@@ -0,0 +1,54 @@
+"""Diagnostics support for AVGear Matrix."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from .coordinator import AVGearMatrixConfigEntry
+
+TO_REDACT = {CONF_HOST}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: AVGearMatrixConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = entry.runtime_data
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "device_info": coordinator.device_info,
+        "num_inputs": coordinator.num_inputs,
+        "num_outputs": coordinator.num_outputs,
+        "state": {
+            "version": coordinator.data.version,
+            "routes": coordinator.data.routes_dict(),
+            "power": coordinator.data.power,
+            "hdbt_power": coordinator.data.hdbt_power,
+            "output_power": coordinator.data.output_power_dict(),
+            "restored": coordinator.restored,
+        },
+        "desired_state": {
+            "routes": coordinator.desired_routes,
+            "output_power": coordinator.desired_output_power,
+        },
+        "polling": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": coordinator.update_interval.total_seconds()
+            if coordinator.update_interval
+            else None,
+        },
+        "session": {
+            "connected": coordinator.session.connected,
+            "connects": coordinator.session.connect_count,
+        },
+        "circuit": coordinator.breaker.as_dict(),
+        "stats": coordinator.stats.as_dict(),
+        "trace": coordinator.trace.as_dict(),
+    }
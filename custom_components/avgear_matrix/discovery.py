@@ -0,0 +1,88 @@
+"""Network discovery of AVGear matrices."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+import contextlib
+from dataclasses import dataclass
+import logging
+
+from hdmimatrix.hdmimatrix import Commands
+
+from .const import (
+    DISCOVERY_CONCURRENCY,
+    DISCOVERY_CONNECT_TIMEOUT,
+    IDENTIFY_IDLE_TIMEOUT,
+    IDENTIFY_TIMEOUT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+SOCKET_READ_SIZE = 2048
+
+
+@dataclass(frozen=True)
+class DiscoveredMatrix:
+    """A device that answered the name and type queries."""
+
+    host: str
+    port: int
+    name: str
+    device_type: str
+
+
+async def async_identify(
+    host: str, port: int, connect_timeout: float = DISCOVERY_CONNECT_TIMEOUT
+) -> DiscoveredMatrix | None:
+    """Ask a device for its name and type in one exchange.
+
+    Unlike the library this neither powers the device on nor waits a fixed
+    second for a welcome banner: any banner is skipped as soon as the device
+    goes quiet, then both queries are written at once and the first two
+    lines of the reply answer them. Returns None if something answers the
+    port but not like a matrix, and raises OSError if nothing does.
+    """
+    async with asyncio.timeout(connect_timeout):
+        reader, writer = await asyncio.open_connection(host, port)
+    lines: list[str] = []
+    try:
+        # A banner line could be taken for a reply, drop whatever comes first
+        with contextlib.suppress(TimeoutError):
+            async with asyncio.timeout(IDENTIFY_TIMEOUT):
+                while await asyncio.wait_for(
+                    reader.read(SOCKET_READ_SIZE), IDENTIFY_IDLE_TIMEOUT
+                ):
+                    pass
+        writer.write(f"{Commands.NAME.value}{Commands.TYPE.value}".encode("ascii"))
+        with contextlib.suppress(TimeoutError):
+            async with asyncio.timeout(IDENTIFY_TIMEOUT):
+                while len(lines) < 2 and (line := await reader.readline()):
+                    if text := line.decode("ascii", errors="replace").strip():
+                        lines.append(text)
+    finally:
+        writer.close()
+        with contextlib.suppress(OSError):
+            await writer.wait_closed()
+
+    if len(lines) < 2:
+        _LOGGER.debug("%s:%s did not identify itself: %s", host, port, lines)
+        return None
+    return DiscoveredMatrix(host, port, lines[0], lines[1])
+
+
+async def async_discover(hosts: Iterable[str], port: int) -> list[DiscoveredMatrix]:
+    """Probe many hosts concurrently, return the matrices that answered."""
+    semaphore = asyncio.Semaphore(DISCOVERY_CONCURRENCY)
+
+    async def _async_probe(host: str) -> DiscoveredMatrix | None:
+        async with semaphore:
+            try:
+                return await async_identify(host, port)
+            except OSError:
+                return None
+
+    results = await asyncio.gather(*(_async_probe(host) for host in hosts))
+    found = [matrix for matrix in results if matrix is not None]
+    _LOGGER.debug("Discovered %s on port %s", found, port)
+    return found
@@ -0,0 +1,21 @@
+"""Base entity for AVGear Matrix."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import ATTR_RESTORED
+from .coordinator import AVGearMatrixDataUpdateCoordinator
+
+
+class AvgearMatrixEntity(CoordinatorEntity[AVGearMatrixDataUpdateCoordinator]):
+    """Base entity for AVGear Matrix routing and power state."""
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Flag state restored from the last run until the device answers."""
+        if self.coordinator.restored:
+            return {ATTR_RESTORED: True}
+        return None
@@ -0,0 +1,107 @@
+"""Priority access to the AVGear Matrix session."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from itertools import count
+import logging
+from time import monotonic
+
+from .stats import AVGearMatrixStats
+
+_LOGGER = logging.getLogger(__name__)
+
+# Lower values are served first
+PRIORITY_COMMAND = 0
+PRIORITY_POLL = 1
+PRIORITY_NAMES = {PRIORITY_COMMAND: "command", PRIORITY_POLL: "poll"}
+
+
+@dataclass
+class _Waiter:
+    """A task waiting for its turn on the device."""
+
+    priority: int
+    sequence: int
+    queued: float = field(default_factory=monotonic)
+    future: asyncio.Future[None] = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
+
+
+class PriorityLock:
+    """Lock handing the device to waiters in priority order.
+
+    Interactive commands are served before queued polls, oldest first within
+    a priority. Once waiters have waited max_wait seconds they are served
+    strictly in arrival order regardless of priority, so a steady stream of
+    commands cannot starve polls.
+    """
+
+    def __init__(self, max_wait: float, stats: AVGearMatrixStats) -> None:
+        """Initialize the lock."""
+        self._max_wait = max_wait
+        self._stats = stats
+        self._locked = False
+        self._waiters: list[_Waiter] = []
+        self._sequence = count()
+        # Seconds the current holder waited, for tracing
+        self.last_wait = 0.0
+
+    def locked(self) -> bool:
+        """Return true if the lock is held."""
+        return self._locked
+
+    @asynccontextmanager
+    async def acquire(self, priority: int) -> AsyncIterator[None]:
+        """Hold the lock for the duration of the context."""
+        await self._async_acquire(priority)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _async_acquire(self, priority: int) -> None:
+        if not self._locked and not self._waiters:
+            self._locked = True
+            self.last_wait = 0.0
+            self._stats.lock_wait[PRIORITY_NAMES[priority]].record(0)
+            return
+        waiter = _Waiter(priority, next(self._sequence))
+        self._waiters.append(waiter)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            elif not waiter.future.cancelled():
+                # Handed the lock just as we were cancelled, pass it on
+                self._release()
+            raise
+        waited = self.last_wait = monotonic() - waiter.queued
+        self._stats.lock_wait[PRIORITY_NAMES[priority]].record(waited)
+        _LOGGER.debug("Waited %.3fs for the device at priority %s", waited, priority)
+
+    def _release(self) -> None:
+        now = monotonic()
+        while self._waiters:
+            # Waiters past max_wait are served strictly oldest first
+            waiter = min(
+                self._waiters,
+                key=lambda waiter: (
+                    (0, 0, waiter.sequence)
+                    if now - waiter.queued >= self._max_wait
+                    else (1, waiter.priority, waiter.sequence)
+                ),
+            )
+            self._waiters.remove(waiter)
+            if waiter.future.done():
+                # Cancelled, its task has not run yet to remove itself
+                continue
+            # The lock stays held and passes straight to the chosen waiter
+            waiter.future.set_result(None)
+            return
+        self._locked = False
@@ -1,5 +1,6 @@
 """Select platform for AVGear Matrix."""
 
+from functools import cache
 import logging
 
 from homeassistant.components.select import SelectEntity, SelectEntityDescription
@@ -7,7 +8,9 @@ from homeassistant.config_entries import ConfigEntry
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import CONF_OPTIMISTIC_ROUTING, DATA_ROUTING, DEFAULT_OPTIMISTIC_ROUTING
+from .entity import AvgearMatrixEntity
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -18,6 +21,12 @@ SELECT_DESCRIPTION = SelectEntityDescription(
 )
 
 
+@cache
+def _input_options(num_inputs: int) -> tuple[str, ...]:
+    """Return the input labels, shared by every output of every matrix that size."""
+    return tuple(str(input_num) for input_num in range(1, num_inputs + 1))
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -34,14 +43,14 @@ async def async_setup_entry(
     async_add_entities(entities)
 
 
-class AvgearMatrixSelect(CoordinatorEntity, SelectEntity):
+class AvgearMatrixSelect(AvgearMatrixEntity, SelectEntity):
     """Select entity for matrix output."""
 
     def __init__(
         self, coordinator, description: SelectEntityDescription, output_num
     ) -> None:
         """Set up the AVGear Select platform."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, (DATA_ROUTING, output_num))
         self.entity_description = description
 
         _LOGGER.debug("OutputNum: %s", output_num)
@@ -52,20 +61,24 @@ class AvgearMatrixSelect(CoordinatorEntity, SelectEntity):
         self._attr_translation_key = "matrix_output"
         self._attr_translation_placeholders = {"number": str(output_num)}
 
-        self._attr_options = [str(i) for i in range(1, coordinator.num_inputs + 1)]
+        self._attr_options = _input_options(coordinator.num_inputs)
 
         self._attr_device_info = coordinator.ha_device_info
 
     @property
     def available(self) -> bool:
         """Return true if the matrix is powered on."""
-        return bool(self.coordinator.is_powered_on)
+        return bool(self.coordinator.data.power)
 
     @property
     def current_option(self):
         """Return the current input for this output."""
-        current_input = self.coordinator.data.get(self.output_num)
-        return str(current_input) if current_input else "1"
+        current_input = self.coordinator.data.route(self.output_num)
+        if not current_input:
+            return "1"
+        if current_input <= len(self._attr_options):
+            return self._attr_options[current_input - 1]
+        return str(current_input)
 
     async def async_select_option(self, option: str) -> None:
         """Change the input for this output."""
@@ -73,6 +86,13 @@ class AvgearMatrixSelect(CoordinatorEntity, SelectEntity):
             # Convert option back to int and route to this output
             input_num = int(option)
 
+            if self.coordinator.config_entry.options.get(
+                CONF_OPTIMISTIC_ROUTING, DEFAULT_OPTIMISTIC_ROUTING
+            ):
+                # Shown at once, confirmed or rolled back in the background
+                self.coordinator.async_route_optimistically(input_num, self.output_num)
+                return
+
             # Use coordinator method instead of direct matrix access
             result = await self.coordinator.async_route_input_to_output(
                 input_num, self.output_num
@@ -1,46 +1,125 @@
 """Sensor platform for AVGear Matrix."""
 
+from collections.abc import Callable
+from dataclasses import dataclass
 import logging
 
-from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import EntityCategory
+from homeassistant.const import EntityCategory, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .const import CONTEXT_DEVICE_INFO, CONTEXT_STATS
+from .coordinator import AVGearMatrixDataUpdateCoordinator
+
 _LOGGER = logging.getLogger(__name__)
 
+
+@dataclass(frozen=True, kw_only=True)
+class AvgearMatrixSensorEntityDescription(SensorEntityDescription):
+    """Sensor description with the function that reads its value."""
+
+    value_fn: Callable[[AVGearMatrixDataUpdateCoordinator], StateType]
+
+
+def _ms(seconds: float | None) -> float | None:
+    return None if seconds is None else seconds * 1000
+
+
 SENSOR_DESCRIPTIONS = [
-    SensorEntityDescription(
+    AvgearMatrixSensorEntityDescription(
         key="device_name",
         translation_key="device_name",
+        value_fn=lambda coordinator: (coordinator.device_info or {}).get("model"),
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    AvgearMatrixSensorEntityDescription(
         key="device_type",
         translation_key="device_type",
+        value_fn=lambda coordinator: (coordinator.device_info or {}).get("type"),
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    AvgearMatrixSensorEntityDescription(
         key="num_inputs",
         translation_key="num_inputs",
+        value_fn=lambda coordinator: coordinator.num_inputs,
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    AvgearMatrixSensorEntityDescription(
         key="num_outputs",
         translation_key="num_outputs",
+        value_fn=lambda coordinator: coordinator.num_outputs,
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    AvgearMatrixSensorEntityDescription(
         key="firmware_version",
         translation_key="firmware_version",
+        value_fn=lambda coordinator: (coordinator.device_info or {}).get("version"),
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    AvgearMatrixSensorEntityDescription(
         key="lib_version",
         translation_key="lib_version",
+        value_fn=lambda coordinator: (coordinator.device_info or {}).get("lib_version"),
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+]
+
+# Performance statistics, disabled by default
+STATS_SENSOR_DESCRIPTIONS = [
+    AvgearMatrixSensorEntityDescription(
+        key="poll_duration",
+        translation_key="poll_duration",
+        value_fn=lambda coordinator: _ms(coordinator.stats.last_poll_duration),
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+    ),
+    AvgearMatrixSensorEntityDescription(
+        key="command_latency",
+        translation_key="command_latency",
+        value_fn=lambda coordinator: _ms(coordinator.stats.mean_latency("command")),
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+    ),
+    AvgearMatrixSensorEntityDescription(
+        key="update_failures",
+        translation_key="update_failures",
+        value_fn=lambda coordinator: coordinator.stats.update_failures,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    AvgearMatrixSensorEntityDescription(
+        key="reconnects",
+        translation_key="reconnects",
+        value_fn=lambda coordinator: coordinator.stats.reconnects,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    AvgearMatrixSensorEntityDescription(
+        key="timeouts",
+        translation_key="timeouts",
+        value_fn=lambda coordinator: coordinator.stats.timeouts,
         entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
     ),
 ]
 
@@ -53,17 +132,56 @@ async def async_setup_entry(
     """Set up the AVGear Sensor platform."""
     coordinator = config_entry.runtime_data
     async_add_entities(
-        AvgearMatrixSensor(coordinator, description)
-        for description in SENSOR_DESCRIPTIONS
+        [
+            *(
+                AvgearMatrixSensor(coordinator, description)
+                for description in SENSOR_DESCRIPTIONS
+            ),
+            *(
+                AvgearMatrixStatsSensor(coordinator, description)
+                for description in STATS_SENSOR_DESCRIPTIONS
+            ),
+        ]
     )
 
 
 class AvgearMatrixSensor(CoordinatorEntity, SensorEntity):
     """Sensor entity for AVGear Matrix device information."""
 
-    def __init__(self, coordinator, description: SensorEntityDescription) -> None:
+    entity_description: AvgearMatrixSensorEntityDescription
+
+    def __init__(
+        self, coordinator, description: AvgearMatrixSensorEntityDescription
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, CONTEXT_DEVICE_INFO)
+        self.entity_description = description
+        self._attr_has_entity_name = True
+        self._attr_unique_id = f"{coordinator.device_id}_{description.key}"
+        self._attr_translation_key = description.key
+        self._attr_device_info = coordinator.ha_device_info
+
+    @property
+    def available(self) -> bool:
+        """Return true; device information stays valid while polls fail."""
+        return True
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the sensor value."""
+        return self.entity_description.value_fn(self.coordinator)
+
+
+class AvgearMatrixStatsSensor(CoordinatorEntity, SensorEntity):
+    """Sensor entity for AVGear Matrix performance statistics."""
+
+    entity_description: AvgearMatrixSensorEntityDescription
+
+    def __init__(
+        self, coordinator, description: AvgearMatrixSensorEntityDescription
+    ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, CONTEXT_STATS)
         self.entity_description = description
         self._attr_has_entity_name = True
         self._attr_unique_id = f"{coordinator.device_id}_{description.key}"
@@ -71,19 +189,11 @@ class AvgearMatrixSensor(CoordinatorEntity, SensorEntity):
         self._attr_device_info = coordinator.ha_device_info
 
     @property
-    def native_value(self):
+    def available(self) -> bool:
+        """Return true; failures are what some of these sensors count."""
+        return True
+
+    @property
+    def native_value(self) -> StateType:
         """Return the sensor value."""
-        info = self.coordinator.device_info or {}
-        if self.entity_description.key == "device_name":
-            return info.get("model")
-        if self.entity_description.key == "device_type":
-            return info.get("type")
-        if self.entity_description.key == "num_inputs":
-            return self.coordinator.num_inputs
-        if self.entity_description.key == "num_outputs":
-            return self.coordinator.num_outputs
-        if self.entity_description.key == "firmware_version":
-            return info.get("version")
-        if self.entity_description.key == "lib_version":
-            return info.get("lib_version")
-        return None
+        return self.entity_description.value_fn(self.coordinator)
@@ -0,0 +1,181 @@
+"""Services for the AVGear Matrix integration."""
+
+from __future__ import annotations
+
+import logging
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .const import ATTR_CONFIG_ENTRY_ID, DOMAIN
+from .coordinator import AVGearMatrixDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_APPLY_ROUTES = "apply_routes"
+SERVICE_SNAPSHOT = "snapshot"
+SERVICE_RESTORE = "restore"
+SERVICE_SET_OUTPUTS_POWER = "set_outputs_power"
+SERVICE_START_TRACE = "start_trace"
+SERVICE_STOP_TRACE = "stop_trace"
+
+ATTR_ROUTES = "routes"
+ATTR_NAME = "name"
+ATTR_OUTPUTS = "outputs"
+ATTR_POWER = "power"
+
+DEFAULT_SNAPSHOT_NAME = "default"
+
+APPLY_ROUTES_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_ROUTES): vol.Schema(
+            {vol.Coerce(int): vol.Coerce(int)}
+        ),
+    }
+)
+
+SNAPSHOT_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_NAME, default=DEFAULT_SNAPSHOT_NAME): cv.string,
+    }
+)
+
+SET_OUTPUTS_POWER_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_OUTPUTS): vol.All(cv.ensure_list, [vol.Coerce(int)]),
+        vol.Required(ATTR_POWER): cv.boolean,
+    }
+)
+
+TRACE_SCHEMA = vol.Schema({vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string})
+
+
+def _get_coordinator(call: ServiceCall) -> AVGearMatrixDataUpdateCoordinator:
+    """Return the coordinator of the config entry a service call targets."""
+    entry_id = call.data[ATTR_CONFIG_ENTRY_ID]
+    entry = call.hass.config_entries.async_get_entry(entry_id)
+    if entry is None or entry.domain != DOMAIN:
+        raise ServiceValidationError(f"No AVGear Matrix config entry {entry_id}")
+    if entry.state is not ConfigEntryState.LOADED:
+        raise ServiceValidationError(f"AVGear Matrix {entry.title} is not loaded")
+    return entry.runtime_data
+
+
+async def _async_apply_routes(call: ServiceCall) -> None:
+    """Route several outputs at once."""
+    coordinator = _get_coordinator(call)
+    routes: dict[int, int] = call.data[ATTR_ROUTES]
+    for output_num, input_num in routes.items():
+        if not 1 <= output_num <= coordinator.num_outputs:
+            raise ServiceValidationError(f"Invalid output {output_num}")
+        if not 1 <= input_num <= coordinator.num_inputs:
+            raise ServiceValidationError(f"Invalid input {input_num}")
+
+    if not await coordinator.async_apply_routes(routes):
+        raise HomeAssistantError(f"Failed to apply routes {routes}")
+
+
+async def _async_snapshot(call: ServiceCall) -> ServiceResponse:
+    """Save the current routing and output power of a matrix."""
+    coordinator = _get_coordinator(call)
+    if not coordinator.last_update_success or not coordinator.data.routes:
+        raise HomeAssistantError("The matrix state is not known, nothing to save")
+
+    snapshot = coordinator.async_snapshot(call.data[ATTR_NAME])
+    return {
+        key: {str(port): value for port, value in ports.items()}
+        for key, ports in snapshot.items()
+    }
+
+
+async def _async_restore(call: ServiceCall) -> None:
+    """Bring a matrix back to a saved snapshot."""
+    coordinator = _get_coordinator(call)
+    name = call.data[ATTR_NAME]
+    if name not in coordinator.snapshots:
+        raise ServiceValidationError(f"No snapshot named {name}")
+    if not coordinator.data.power:
+        raise HomeAssistantError("The matrix is off, cannot restore a snapshot")
+
+    if not await coordinator.async_restore(name):
+        raise HomeAssistantError(f"Failed to restore snapshot {name}")
+
+
+async def _async_set_outputs_power(call: ServiceCall) -> None:
+    """Power several outputs on or off at once."""
+    coordinator = _get_coordinator(call)
+    outputs: list[int] = call.data[ATTR_OUTPUTS]
+    for output_num in outputs:
+        if not 1 <= output_num <= coordinator.num_outputs:
+            raise ServiceValidationError(f"Invalid output {output_num}")
+    if not coordinator.data.power:
+        raise HomeAssistantError("The matrix is off, cannot power outputs")
+
+    power: bool = call.data[ATTR_POWER]
+    if not await coordinator.async_set_outputs_power(
+        dict.fromkeys(outputs, power)
+    ):
+        raise HomeAssistantError(
+            f"Failed to power {'on' if power else 'off'} outputs {outputs}"
+        )
+
+
+async def _async_start_trace(call: ServiceCall) -> None:
+    """Start recording every exchange with a matrix."""
+    coordinator = _get_coordinator(call)
+    coordinator.trace.start()
+    _LOGGER.info("Tracing exchanges with %s", coordinator.host)
+
+
+async def _async_stop_trace(call: ServiceCall) -> None:
+    """Stop recording, keeping the trace for diagnostics."""
+    coordinator = _get_coordinator(call)
+    coordinator.trace.stop()
+    _LOGGER.info(
+        "Stopped tracing %s, %s exchanges recorded",
+        coordinator.host,
+        len(coordinator.trace.entries),
+    )
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the AVGear Matrix services."""
+    hass.services.async_register(
+        DOMAIN, SERVICE_APPLY_ROUTES, _async_apply_routes, schema=APPLY_ROUTES_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SNAPSHOT,
+        _async_snapshot,
+        schema=SNAPSHOT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_RESTORE, _async_restore, schema=SNAPSHOT_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_OUTPUTS_POWER,
+        _async_set_outputs_power,
+        schema=SET_OUTPUTS_POWER_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_START_TRACE, _async_start_trace, schema=TRACE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_STOP_TRACE, _async_stop_trace, schema=TRACE_SCHEMA
+    )
@@ -0,0 +1,287 @@
+"""Persistent TCP session for AVGear Matrix."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Sequence
+from contextlib import suppress
+import logging
+import socket
+from time import monotonic
+from typing import Any, TypeVar
+
+from hdmimatrix import AsyncHDMIMatrix
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.singleton import singleton
+
+from .const import (
+    CONF_CONNECT_TIMEOUT,
+    CONF_QUERY_TIMEOUT,
+    DATA_SESSION_SEMAPHORE,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_QUERY_TIMEOUT,
+    KEEPALIVE_COUNT,
+    KEEPALIVE_IDLE,
+    KEEPALIVE_INTERVAL,
+    MAX_CONCURRENT_SESSIONS,
+    REPLY_IDLE_TIMEOUT,
+    REPLY_TIMEOUT,
+    SESSION_IDLE_TIMEOUT,
+)
+from .stats import AVGearMatrixStats
+from .trace import TraceEntry
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+SOCKET_READ_SIZE = 2048
+
+
+@singleton(DATA_SESSION_SEMAPHORE)
+def async_get_session_semaphore(hass: HomeAssistant) -> asyncio.Semaphore:
+    """Return the semaphore capping operations in flight across all matrices."""
+    return asyncio.Semaphore(MAX_CONCURRENT_SESSIONS)
+
+
+class AVGearMatrixSession:
+    """Keep one TCP connection to the matrix open between operations.
+
+    The connection is opened lazily, kept alive with TCP keepalive, closed
+    after SESSION_IDLE_TIMEOUT seconds without use and transparently
+    re-established when the device drops it.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        matrix: AsyncHDMIMatrix,
+        stats: AVGearMatrixStats,
+    ) -> None:
+        """Initialize the session."""
+        self.hass = hass
+        self.entry = entry
+        self.matrix = matrix
+        self.stats = stats
+        self.connect_count = 0
+        self._semaphore = async_get_session_semaphore(hass)
+        self._unsub_idle: CALLBACK_TYPE | None = None
+
+    @property
+    def connect_timeout(self) -> float:
+        """Return the seconds a connection attempt may take."""
+        return self.entry.options.get(CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT)
+
+    @property
+    def query_timeout(self) -> float:
+        """Return the seconds a single operation may take once connected."""
+        return self.entry.options.get(CONF_QUERY_TIMEOUT, DEFAULT_QUERY_TIMEOUT)
+
+    @property
+    def connected(self) -> bool:
+        """Return true if the underlying connection is usable."""
+        reader = self.matrix.reader
+        return self.matrix.is_connected and reader is not None and not reader.at_eof()
+
+    async def async_connect(self) -> None:
+        """Open the connection unless a healthy one already exists."""
+        if self.connected:
+            return
+        if self.matrix.is_connected:
+            # The device closed its end while we were idle
+            _LOGGER.debug("Session to %s closed by device, reconnecting", self.matrix.host)
+            self.stats.reconnects += 1
+            await self.async_close()
+        try:
+            async with asyncio.timeout(self.connect_timeout):
+                connected = await self.matrix.connect()
+        except TimeoutError:
+            self.stats.timeouts += 1
+            self.stats.connection_errors += 1
+            self._reset()
+            raise ConnectionError(
+                f"Timed out connecting to {self.matrix.host}:{self.matrix.port}"
+            ) from None
+        if not connected:
+            self.stats.connection_errors += 1
+            raise ConnectionError(
+                f"Failed to connect to {self.matrix.host}:{self.matrix.port}"
+            )
+        self.connect_count += 1
+        _LOGGER.debug("Session to %s opened", self.matrix.host)
+        self._enable_keepalive()
+
+    async def async_close(self) -> None:
+        """Close the connection."""
+        self._cancel_idle_timer()
+        if (writer := self.matrix.writer) is None:
+            return
+        # Detach before waiting, an operation may open a new connection while
+        # this one closes and must not have it cleared underneath it
+        self.matrix.writer = None
+        self.matrix.reader = None
+        writer.close()
+        with suppress(OSError):
+            await writer.wait_closed()
+        _LOGGER.debug("Session to %s closed", self.matrix.host)
+
+    def _reset(self) -> None:
+        """Drop the connection at once, discarding anything still in flight."""
+        self._cancel_idle_timer()
+        if self.matrix.writer is not None:
+            self.matrix.writer.transport.abort()
+            _LOGGER.debug("Session to %s reset", self.matrix.host)
+        self.matrix.writer = None
+        self.matrix.reader = None
+
+    async def async_run(
+        self,
+        operation: Callable[[AsyncHDMIMatrix], Awaitable[_T]],
+        deadline: float | None = None,
+        trace: TraceEntry | None = None,
+    ) -> _T:
+        """Run an operation against the matrix, reconnecting once on failure.
+
+        Each attempt may take deadline seconds once connected, the configured
+        query timeout by default. Callers must serialise access; the session
+        itself is only limited by the integration-wide cap on operations in
+        flight.
+        """
+        if deadline is None:
+            deadline = self.query_timeout
+        self._cancel_idle_timer()
+        async with self._semaphore:
+            reused = self.connected
+            try:
+                return await self._async_run_once(operation, deadline, trace)
+            except ConnectionError as err:
+                if not reused:
+                    raise
+                # A long-lived connection may have gone stale, retry on a fresh one
+                _LOGGER.debug("Session to %s lost: %s", self.matrix.host, err)
+                self.stats.reconnects += 1
+                return await self._async_run_once(operation, deadline, trace)
+            finally:
+                if self.matrix.writer is not None:
+                    self._schedule_idle_close()
+
+    async def _async_run_once(
+        self,
+        operation: Callable[[AsyncHDMIMatrix], Awaitable[_T]],
+        deadline: float,
+        trace: TraceEntry | None,
+    ) -> _T:
+        connects = self.connect_count
+        await self.async_connect()
+        if trace is not None:
+            trace.connected = monotonic()
+            trace.new_connection = self.connect_count != connects
+        try:
+            async with asyncio.timeout(deadline):
+                result = await operation(self.matrix)
+        except TimeoutError as err:
+            # A half-open connection, don't wait for it to close gracefully
+            self.stats.timeouts += 1
+            self._reset()
+            raise ConnectionError(
+                f"No answer from {self.matrix.host} within {deadline}s"
+            ) from err
+        except asyncio.CancelledError:
+            # A partly read reply would end up in front of the next one
+            self._reset()
+            raise
+        except (OSError, RuntimeError) as err:
+            # hdmimatrix reports connection loss as RuntimeError
+            self.stats.connection_errors += 1
+            await self.async_close()
+            raise ConnectionError(str(err)) from err
+        if not self.connected:
+            # Replies read from a closing socket are empty, not errors
+            self.stats.connection_errors += 1
+            await self.async_close()
+            raise ConnectionError("Connection closed by device")
+        return result
+
+    async def async_exchange(
+        self, requests: Sequence[bytes], trace: TraceEntry | None = None
+    ) -> str:
+        """Send requests back-to-back and return all of their replies.
+
+        The replies are read into a single buffer which is complete once the
+        device has been quiet for REPLY_IDLE_TIMEOUT, so a batch costs one
+        network round trip instead of one per request.
+        """
+
+        async def _exchange(matrix: AsyncHDMIMatrix) -> str:
+            data = b"".join(requests)
+            matrix.writer.write(data)
+            await matrix.writer.drain()
+            if trace is not None:
+                trace.sent = monotonic()
+                trace.request = data
+            _LOGGER.debug("Sent batch: %s", requests)
+            return await _async_read_replies(matrix.reader, trace)
+
+        return await self.async_run(_exchange, trace=trace)
+
+    def _enable_keepalive(self) -> None:
+        """Enable TCP keepalive so dead peers are detected while idle."""
+        sock = self.matrix.writer.get_extra_info("socket")
+        if sock is None:
+            return
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        for option, value in (
+            ("TCP_KEEPIDLE", KEEPALIVE_IDLE),
+            ("TCP_KEEPINTVL", KEEPALIVE_INTERVAL),
+            ("TCP_KEEPCNT", KEEPALIVE_COUNT),
+        ):
+            if hasattr(socket, option):
+                sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, option), value)
+
+    def _schedule_idle_close(self) -> None:
+        self._cancel_idle_timer()
+        self._unsub_idle = async_call_later(
+            self.hass, SESSION_IDLE_TIMEOUT, self._async_idle_timeout
+        )
+
+    def _cancel_idle_timer(self) -> None:
+        if self._unsub_idle is not None:
+            self._unsub_idle()
+            self._unsub_idle = None
+
+    async def _async_idle_timeout(self, _now: Any) -> None:
+        self._unsub_idle = None
+        _LOGGER.debug("Session to %s idle, closing", self.matrix.host)
+        await self.async_close()
+
+
+async def _async_read_replies(
+    reader: asyncio.StreamReader, trace: TraceEntry | None = None
+) -> str:
+    """Read until the device goes quiet or REPLY_TIMEOUT expires."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + REPLY_TIMEOUT
+    chunks: list[bytes] = []
+    while (remaining := deadline - loop.time()) > 0:
+        # Wait the full window for the first byte, then only for the idle gap
+        wait = min(remaining, REPLY_IDLE_TIMEOUT) if chunks else remaining
+        try:
+            data = await asyncio.wait_for(reader.read(SOCKET_READ_SIZE), wait)
+        except TimeoutError:
+            break
+        if not data:
+            raise ConnectionError("Connection closed by device")
+        if trace is not None and not chunks:
+            trace.first_byte = monotonic()
+        chunks.append(data)
+    raw = b"".join(chunks)
+    if trace is not None:
+        trace.complete = monotonic()
+        trace.response = raw
+    response = raw.decode("ascii", errors="ignore").strip()
+    _LOGGER.debug("Received batch reply: %r", response)
+    return response
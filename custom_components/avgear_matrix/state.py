@@ -0,0 +1,122 @@
+"""Routing and power state of an AVGear matrix."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, replace
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class MatrixState:
+    """Immutable snapshot of a matrix's routing and power.
+
+    Routing is a tuple indexed by output number - 1 holding the input, 0
+    where unknown. Output power is a pair of bitmasks with bit output
+    number - 1 set when the power of that output is known and when it is
+    on. Every change produces a new snapshot with a higher version, so
+    readers never see a half-applied update and an unchanged version means
+    nothing changed.
+    """
+
+    version: int = 0
+    routes: tuple[int, ...] = ()
+    power: bool | None = None
+    hdbt_power: bool | None = None
+    output_power_known: int = 0
+    output_power_on: int = 0
+
+    def route(self, output_num: int) -> int | None:
+        """Return the input routed to an output, None if unknown."""
+        if 0 < output_num <= len(self.routes):
+            return self.routes[output_num - 1] or None
+        return None
+
+    def output_power(self, output_num: int) -> bool | None:
+        """Return true if an output is on, None if unknown."""
+        bit = 1 << (output_num - 1)
+        if not self.output_power_known & bit:
+            return None
+        return bool(self.output_power_on & bit)
+
+    def routes_dict(self) -> dict[int, int]:
+        """Return the known routes as an output -> input mapping."""
+        return {
+            output_num: input_num
+            for output_num, input_num in enumerate(self.routes, 1)
+            if input_num
+        }
+
+    def output_power_dict(self) -> dict[int, bool]:
+        """Return the known output power states as an output -> on mapping."""
+        return {
+            output_num: bool(self.output_power_on & 1 << (output_num - 1))
+            for output_num in range(1, self.output_power_known.bit_length() + 1)
+            if self.output_power_known & 1 << (output_num - 1)
+        }
+
+    def diff(self, old: MatrixState) -> dict[str, Any]:
+        """Return what changed since an older state, empty if nothing did.
+
+        Only the outputs whose route or power changed are included, with
+        None where a value became unknown.
+        """
+        changes: dict[str, Any] = {
+            key: getattr(self, key)
+            for key in ("power", "hdbt_power")
+            if getattr(self, key) != getattr(old, key)
+        }
+        if self.routes != old.routes:
+            changes["routes"] = {
+                output_num: self.route(output_num)
+                for output_num in range(1, max(len(self.routes), len(old.routes)) + 1)
+                if self.route(output_num) != old.route(output_num)
+            }
+        if power_diff := (self.output_power_known ^ old.output_power_known) | (
+            self.output_power_on ^ old.output_power_on
+        ):
+            changes["output_power"] = {
+                output_num: self.output_power(output_num)
+                for output_num in range(1, power_diff.bit_length() + 1)
+                if power_diff & 1 << (output_num - 1)
+            }
+        return {key: value for key, value in changes.items() if value != {}}
+
+    def evolve(
+        self,
+        *,
+        routes: Mapping[int, int | None] | None = None,
+        output_power: Mapping[int, bool | None] | None = None,
+        **changes: bool | None,
+    ) -> MatrixState:
+        """Return the state with some routes, output power or main/HdBT power changed.
+
+        A None route or output power makes it unknown again. Returns this
+        very snapshot if nothing actually changes.
+        """
+        new_routes = self.routes
+        if routes:
+            length = max(len(self.routes), max(routes))
+            updated = list(self.routes) + [0] * (length - len(self.routes))
+            for output_num, input_num in routes.items():
+                updated[output_num - 1] = input_num or 0
+            new_routes = tuple(updated)
+        known, on = self.output_power_known, self.output_power_on
+        for output_num, output_on in (output_power or {}).items():
+            bit = 1 << (output_num - 1)
+            known = known | bit if output_on is not None else known & ~bit
+            on = on | bit if output_on else on & ~bit
+        if (
+            new_routes == self.routes
+            and (known, on) == (self.output_power_known, self.output_power_on)
+            and all(getattr(self, key) == value for key, value in changes.items())
+        ):
+            return self
+        return replace(
+            self,
+            version=self.version + 1,
+            routes=new_routes,
+            output_power_known=known,
+            output_power_on=on,
+            **changes,
+        )
@@ -0,0 +1,106 @@
+"""Latency and error statistics for the AVGear Matrix integration."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+@dataclass
+class LatencyHistogram:
+    """Distribution of the durations of one kind of operation."""
+
+    buckets: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    total: float = 0.0
+    maximum: float = 0.0
+    last: float | None = None
+
+    @property
+    def count(self) -> int:
+        """Return the number of recorded durations."""
+        return sum(self.buckets)
+
+    def record(self, seconds: float) -> None:
+        """Record one duration."""
+        index = next(
+            (i for i, bound in enumerate(LATENCY_BUCKETS) if seconds <= bound),
+            len(LATENCY_BUCKETS),
+        )
+        self.buckets[index] += 1
+        self.total += seconds
+        self.maximum = max(self.maximum, seconds)
+        self.last = seconds
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram in milliseconds for diagnostics."""
+        labels = [f"<={bound * 1000:g}ms" for bound in LATENCY_BUCKETS]
+        labels.append(f">{LATENCY_BUCKETS[-1] * 1000:g}ms")
+        return {
+            "count": self.count,
+            "mean_ms": _ms(self.total / self.count) if self.count else None,
+            "max_ms": _ms(self.maximum),
+            "last_ms": _ms(self.last),
+            "buckets": dict(zip(labels, self.buckets, strict=True)),
+        }
+
+
+@dataclass
+class AVGearMatrixStats:
+    """Counters and timings of one matrix's traffic."""
+
+    # Keyed by operation, e.g. "poll routing+power" or "command routes"
+    latency: defaultdict[str, LatencyHistogram] = field(
+        default_factory=lambda: defaultdict(LatencyHistogram)
+    )
+    # Keyed by the priority the lock was waited for at
+    lock_wait: defaultdict[str, LatencyHistogram] = field(
+        default_factory=lambda: defaultdict(LatencyHistogram)
+    )
+    timeouts: int = 0
+    # Silent replies that were not expected, e.g. from a matrix that is off
+    empty_replies: int = 0
+    reconnects: int = 0
+    connection_errors: int = 0
+    update_failures: int = 0
+    # Polls skipped while the circuit breaker was open
+    breaker_skips: int = 0
+    last_poll_duration: float | None = None
+
+    def mean_latency(self, kind: str) -> float | None:
+        """Return the mean latency of all operations of a kind, e.g. "poll"."""
+        histograms = [
+            histogram
+            for operation, histogram in self.latency.items()
+            if operation.split(" ", 1)[0] == kind
+        ]
+        if not (count := sum(histogram.count for histogram in histograms)):
+            return None
+        return sum(histogram.total for histogram in histograms) / count
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics for diagnostics."""
+        return {
+            "latency": {
+                operation: histogram.as_dict()
+                for operation, histogram in sorted(self.latency.items())
+            },
+            "lock_wait": {
+                priority: histogram.as_dict()
+                for priority, histogram in sorted(self.lock_wait.items())
+            },
+            "timeouts": self.timeouts,
+            "empty_replies": self.empty_replies,
+            "reconnects": self.reconnects,
+            "connection_errors": self.connection_errors,
+            "update_failures": self.update_failures,
+            "breaker_skips": self.breaker_skips,
+            "last_poll_duration_ms": _ms(self.last_poll_duration),
+        }
+
+
+def _ms(seconds: float | None) -> float | None:
+    return None if seconds is None else round(seconds * 1000, 1)
@@ -7,7 +7,15 @@ from homeassistant.config_entries import ConfigEntry
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import (
+    CONTEXT_ALL_OUTPUTS_POWER,
+    CONTEXT_HDBT_POWER,
+    CONTEXT_POWER,
+    DATA_OUTPUT_POWER,
+    DATA_POWER,
+)
+from .entity import AvgearMatrixEntity
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -22,6 +30,11 @@ HDBT_POWER_SWITCH_DESCRIPTION = SwitchEntityDescription(
     translation_key="hdbt_power",
 )
 
+ALL_OUTPUTS_POWER_SWITCH_DESCRIPTION = SwitchEntityDescription(
+    key="all_outputs_power",
+    translation_key="all_outputs_power",
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -37,18 +50,21 @@ async def async_setup_entry(
     ]
     if "HDBaseT" in device_type:
         entities.append(AvgearMatrixHdbtPowerSwitch(coordinator, HDBT_POWER_SWITCH_DESCRIPTION))
+    entities.append(
+        AvgearMatrixAllOutputsSwitch(coordinator, ALL_OUTPUTS_POWER_SWITCH_DESCRIPTION)
+    )
     for output_num in range(1, coordinator.num_outputs + 1):
         entities.append(AvgearMatrixOutputSwitch(coordinator, output_num))
 
     async_add_entities(entities)
 
 
-class AvgearMatrixPowerSwitch(CoordinatorEntity, SwitchEntity):
+class AvgearMatrixPowerSwitch(AvgearMatrixEntity, SwitchEntity):
     """Switch entity for matrix power state."""
 
     def __init__(self, coordinator, description: SwitchEntityDescription) -> None:
         """Initialize the switch."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, CONTEXT_POWER)
         self.entity_description = description
         self._attr_has_entity_name = True
         self._attr_unique_id = f"{coordinator.device_id}_{description.key}"
@@ -58,13 +74,13 @@ class AvgearMatrixPowerSwitch(CoordinatorEntity, SwitchEntity):
     @property
     def is_on(self) -> bool | None:
         """Return true if the matrix is powered on."""
-        return self.coordinator.is_powered_on
+        return self.coordinator.data.power
 
     async def async_turn_on(self, **kwargs) -> None:
         """Turn the matrix on."""
         result = await self.coordinator.async_power_on()
         if result:
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_refresh_data(DATA_POWER)
         else:
             _LOGGER.warning("Failed to power on matrix")
 
@@ -72,17 +88,17 @@ class AvgearMatrixPowerSwitch(CoordinatorEntity, SwitchEntity):
         """Turn the matrix off."""
         result = await self.coordinator.async_power_off()
         if result:
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_refresh_data(DATA_POWER)
         else:
             _LOGGER.warning("Failed to power off matrix")
 
 
-class AvgearMatrixHdbtPowerSwitch(CoordinatorEntity, SwitchEntity):
+class AvgearMatrixHdbtPowerSwitch(AvgearMatrixEntity, SwitchEntity):
     """Switch entity for HdBT power state."""
 
     def __init__(self, coordinator, description: SwitchEntityDescription) -> None:
         """Initialize the switch."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, CONTEXT_HDBT_POWER)
         self.entity_description = description
         self._attr_has_entity_name = True
         self._attr_unique_id = f"{coordinator.device_id}_{description.key}"
@@ -92,18 +108,18 @@ class AvgearMatrixHdbtPowerSwitch(CoordinatorEntity, SwitchEntity):
     @property
     def available(self) -> bool:
         """Return true if the matrix is powered on."""
-        return bool(self.coordinator.is_powered_on)
+        return bool(self.coordinator.data.power)
 
     @property
     def is_on(self) -> bool | None:
         """Return true if HdBT is powered on."""
-        return self.coordinator.is_hdbt_powered_on
+        return self.coordinator.data.hdbt_power
 
     async def async_turn_on(self, **kwargs) -> None:
         """Turn HdBT on."""
         result = await self.coordinator.async_hdbt_power_on()
         if result:
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_refresh_data(DATA_POWER)
         else:
             _LOGGER.warning("Failed to power on HdBT")
 
@@ -111,17 +127,62 @@ class AvgearMatrixHdbtPowerSwitch(CoordinatorEntity, SwitchEntity):
         """Turn HdBT off."""
         result = await self.coordinator.async_hdbt_power_off()
         if result:
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_refresh_data(DATA_POWER)
         else:
             _LOGGER.warning("Failed to power off HdBT")
 
 
-class AvgearMatrixOutputSwitch(CoordinatorEntity, SwitchEntity):
+class AvgearMatrixAllOutputsSwitch(AvgearMatrixEntity, SwitchEntity):
+    """Switch entity powering every output at once."""
+
+    def __init__(self, coordinator, description: SwitchEntityDescription) -> None:
+        """Initialize the switch."""
+        super().__init__(coordinator, CONTEXT_ALL_OUTPUTS_POWER)
+        self.entity_description = description
+        self._attr_has_entity_name = True
+        self._attr_unique_id = f"{coordinator.device_id}_{description.key}"
+        self._attr_translation_key = description.key
+        self._attr_device_info = coordinator.ha_device_info
+
+    @property
+    def available(self) -> bool:
+        """Return true if the matrix is powered on."""
+        return bool(self.coordinator.data.power)
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return true if any output is powered on, None if none is known."""
+        states = [
+            self.coordinator.data.output_power(output_num)
+            for output_num in range(1, self.coordinator.num_outputs + 1)
+        ]
+        if all(state is None for state in states):
+            return None
+        return any(states)
+
+    async def _async_set_all(self, on: bool) -> None:
+        """Power every output on or off in one batch."""
+        result = await self.coordinator.async_set_outputs_power(
+            dict.fromkeys(range(1, self.coordinator.num_outputs + 1), on)
+        )
+        if not result:
+            _LOGGER.warning("Failed to power %s all outputs", "on" if on else "off")
+
+    async def async_turn_on(self, **kwargs) -> None:
+        """Turn every output on."""
+        await self._async_set_all(True)
+
+    async def async_turn_off(self, **kwargs) -> None:
+        """Turn every output off."""
+        await self._async_set_all(False)
+
+
+class AvgearMatrixOutputSwitch(AvgearMatrixEntity, SwitchEntity):
     """Switch entity for an individual output power state."""
 
     def __init__(self, coordinator, output_num: int) -> None:
         """Initialize the switch."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, (DATA_OUTPUT_POWER, output_num))
         self.output_num = output_num
         self._attr_has_entity_name = True
         self._attr_unique_id = f"{coordinator.device_id}_output_{output_num}_power"
@@ -132,19 +193,19 @@ class AvgearMatrixOutputSwitch(CoordinatorEntity, SwitchEntity):
     @property
     def available(self) -> bool:
         """Return true if the matrix is powered on."""
-        return bool(self.coordinator.is_powered_on)
+        return bool(self.coordinator.data.power)
 
     @property
     def is_on(self) -> bool | None:
         """Return true if this output is powered on."""
-        return self.coordinator.output_power_status.get(self.output_num)
+        return self.coordinator.data.output_power(self.output_num)
 
     async def async_turn_on(self, **kwargs) -> None:
         """Turn this output on."""
         result = await self.coordinator.async_output_on(self.output_num)
         if result:
             self.async_write_ha_state()
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_refresh_data(DATA_OUTPUT_POWER)
         else:
             _LOGGER.warning("Failed to power on output %s", self.output_num)
 
@@ -153,6 +214,6 @@ class AvgearMatrixOutputSwitch(CoordinatorEntity, SwitchEntity):
         result = await self.coordinator.async_output_off(self.output_num)
         if result:
             self.async_write_ha_state()
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_refresh_data(DATA_OUTPUT_POWER)
         else:
             _LOGGER.warning("Failed to power off output %s", self.output_num)
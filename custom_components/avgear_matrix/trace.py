@@ -0,0 +1,111 @@
+"""Wire-level trace of the exchanges with an AVGear matrix."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import TRACE_BUFFER_SIZE
+
+
+@dataclass(slots=True)
+class TraceEntry:
+    """Timings and bytes of one exchange or library query.
+
+    Timestamps are monotonic seconds. Library queries do their own reading
+    and parsing inside hdmimatrix, so only their connect and complete times
+    and no byte counts are known.
+    """
+
+    operation: str
+    lock_wait: float | None
+    start: float = field(default_factory=monotonic)
+    new_connection: bool = False
+    connected: float | None = None
+    sent: float | None = None
+    first_byte: float | None = None
+    complete: float | None = None
+    parsed: float | None = None
+    request: bytes | None = None
+    response: bytes | None = None
+    error: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the entry with each phase in milliseconds since the start."""
+        return {
+            "operation": self.operation,
+            "start": round(self.start, 6),
+            "lock_wait_ms": _ms(self.lock_wait),
+            "new_connection": self.new_connection,
+            **{
+                f"{phase}_ms": _ms(None if stamp is None else stamp - self.start)
+                for phase, stamp in (
+                    ("connected", self.connected),
+                    ("sent", self.sent),
+                    ("first_byte", self.first_byte),
+                    ("complete", self.complete),
+                    ("parsed", self.parsed),
+                )
+            },
+            "bytes_sent": None if self.request is None else len(self.request),
+            "bytes_received": None if self.response is None else len(self.response),
+            "request": _text(self.request),
+            "response": _text(self.response),
+            "error": self.error,
+        }
+
+
+class TraceRecorder:
+    """Ring buffer of the most recent exchanges, recorded while active.
+
+    Callers check active before creating an entry, so an inactive recorder
+    costs one attribute read per exchange.
+    """
+
+    def __init__(self, size: int = TRACE_BUFFER_SIZE) -> None:
+        """Initialize the recorder, inactive."""
+        self.active = False
+        self.started: str | None = None
+        self.entries: deque[TraceEntry] = deque(maxlen=size)
+
+    @property
+    def last(self) -> TraceEntry | None:
+        """Return the most recent entry."""
+        return self.entries[-1] if self.entries else None
+
+    def start(self) -> None:
+        """Discard the previous trace and start recording."""
+        self.entries.clear()
+        self.started = dt_util.utcnow().isoformat()
+        self.active = True
+
+    def stop(self) -> None:
+        """Stop recording, keeping the trace for diagnostics."""
+        self.active = False
+
+    def begin(self, operation: str, lock_wait: float | None) -> TraceEntry:
+        """Record a new exchange and return its entry to fill in."""
+        entry = TraceEntry(operation, lock_wait)
+        self.entries.append(entry)
+        return entry
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the trace for diagnostics."""
+        return {
+            "active": self.active,
+            "started": self.started,
+            "size": self.entries.maxlen,
+            "entries": [entry.as_dict() for entry in self.entries],
+        }
+
+
+def _ms(seconds: float | None) -> float | None:
+    return None if seconds is None else round(seconds * 1000, 3)
+
+
+def _text(data: bytes | None) -> str | None:
+    return None if data is None else data.decode("ascii", errors="backslashreplace")
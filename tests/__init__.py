@@ -0,0 +1 @@
+"""Tests for the AVGear Matrix integration."""
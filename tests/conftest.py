@@ -0,0 +1,87 @@
+"""Fixtures for AVGear Matrix tests, run against the local simulator."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import HomeAssistant
+
+from benchmarks.simulator import MatrixSimulator, SimulatorConfig
+from custom_components.avgear_matrix.const import DOMAIN
+from custom_components.avgear_matrix.coordinator import (
+    AVGearMatrixDataUpdateCoordinator,
+)
+
+HOST = "127.0.0.1"
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Load the integration from custom_components."""
+
+
+@pytest.fixture(autouse=True)
+def allow_simulator_sockets(socket_enabled: None) -> None:
+    """Let the integration connect to the simulator."""
+
+
+@pytest.fixture(autouse=True)
+def short_reply_idle_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Consider replies complete sooner, the simulator answers at once."""
+    monkeypatch.setattr(
+        "custom_components.avgear_matrix.session.REPLY_IDLE_TIMEOUT", 0.05
+    )
+
+
+@pytest.fixture
+async def simulator() -> AsyncIterator[MatrixSimulator]:
+    """Run a simulated 4x4 matrix."""
+    # A banner spares the library's one second wait for one on connect
+    simulator = MatrixSimulator(SimulatorConfig(banner="Welcome\r\n"))
+    await simulator.start(HOST)
+    yield simulator
+    await simulator.stop()
+
+
+@pytest.fixture
+def options() -> dict[str, Any]:
+    """Return the options of the config entry."""
+    return {}
+
+
+@pytest.fixture
+async def config_entry(
+    hass: HomeAssistant, simulator: MatrixSimulator, options: dict[str, Any]
+) -> AsyncIterator[MockConfigEntry]:
+    """Set up a config entry for the simulator."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_HOST: HOST, CONF_PORT: simulator.port},
+        options=options,
+        unique_id=f"{HOST}:{simulator.port}",
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    yield entry
+    await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.fixture
+def coordinator(config_entry: MockConfigEntry) -> AVGearMatrixDataUpdateCoordinator:
+    """Return the coordinator of the config entry."""
+    return config_entry.runtime_data
+
+
+def sent_commands(simulator: MatrixSimulator, since: int) -> list[str]:
+    """Return the commands the simulator got since an index, queries left out."""
+    return [
+        command
+        for command in simulator.stats.commands[since:]
+        if not command.startswith(("STA_", "/*", "/^"))
+    ]
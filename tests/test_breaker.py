@@ -0,0 +1,100 @@
+"""Tests for the circuit breaker for unreachable matrices."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from benchmarks.simulator import MatrixSimulator
+from custom_components.avgear_matrix.breaker import CircuitBreaker
+from custom_components.avgear_matrix.const import DOMAIN
+from custom_components.avgear_matrix.coordinator import (
+    AVGearMatrixDataUpdateCoordinator,
+)
+
+from .conftest import HOST
+
+
+async def test_breaker_opens_and_half_opens() -> None:
+    """Test the circuit opens at the threshold and lets probes through later."""
+    breaker = CircuitBreaker(2, 0.05, 0.2)
+
+    breaker.record_failure()
+    assert breaker.closed
+    breaker.record_failure()
+    assert not breaker.closed
+    assert not breaker.probe_due()
+
+    await asyncio.sleep(0.06)
+    assert breaker.probe_due()
+    # A failed probe backs off further
+    breaker.record_failure()
+    assert not breaker.probe_due()
+    assert 0.05 < breaker.retry_in <= 0.1
+
+    await asyncio.sleep(0.11)
+    assert breaker.probe_due()
+    assert breaker.record_success()
+    assert breaker.closed
+    assert not breaker.record_success()
+
+
+@pytest.fixture
+def short_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Probe an unreachable matrix again after a fraction of a second."""
+    monkeypatch.setattr(
+        "custom_components.avgear_matrix.coordinator.CIRCUIT_MIN_BACKOFF", 0.1
+    )
+
+
+@pytest.mark.usefixtures("short_backoff")
+async def test_unreachable_matrix_skipped_until_probe(
+    coordinator: AVGearMatrixDataUpdateCoordinator, simulator: MatrixSimulator
+) -> None:
+    """Test polls stop while the circuit is open and a probe closes it."""
+    await simulator.stop()
+    for _ in range(3):
+        await coordinator.async_refresh()
+        assert not coordinator.last_update_success
+    assert not coordinator.breaker.closed
+    assert coordinator.stats.update_failures == 3
+
+    # Open: neither polls nor commands go out
+    await coordinator.async_refresh()
+    assert coordinator.stats.breaker_skips == 1
+    assert coordinator.stats.update_failures == 3
+    assert not await coordinator.async_power_off()
+
+    await simulator.start(HOST, simulator.port)
+    await asyncio.sleep(0.11)
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.breaker.closed
+    assert coordinator.data.power
+
+
+async def test_unplugged_matrix_unavailable(
+    hass: HomeAssistant,
+    coordinator: AVGearMatrixDataUpdateCoordinator,
+    simulator: MatrixSimulator,
+) -> None:
+    """Test a matrix going silent on an open connection is not taken for off."""
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "switch", DOMAIN, f"{coordinator.device_id}_power"
+    )
+    simulator.unplug()
+
+    for _ in range(2):
+        await coordinator.async_refresh()
+        assert not coordinator.last_update_success
+    await hass.async_block_till_done()
+
+    assert not coordinator.breaker.closed
+    assert coordinator.data.power
+    assert hass.states.get(entity_id).state == STATE_UNAVAILABLE
@@ -0,0 +1,57 @@
+"""Tests for queueing and coalescing commands."""
+
+from __future__ import annotations
+
+import asyncio
+
+from homeassistant.core import HomeAssistant
+
+from benchmarks.simulator import MatrixSimulator
+from custom_components.avgear_matrix.coordinator import (
+    AVGearMatrixDataUpdateCoordinator,
+)
+
+from .conftest import sent_commands
+
+
+async def test_commands_coalesced_while_waiting(
+    hass: HomeAssistant,
+    coordinator: AVGearMatrixDataUpdateCoordinator,
+    simulator: MatrixSimulator,
+) -> None:
+    """Test commands queued behind a batch in flight merge into one batch."""
+    simulator.config.latency = 0.05
+    since = len(simulator.stats.commands)
+    first = hass.async_create_task(coordinator.async_route_input_to_output(2, 1))
+    # Let the first batch go out, the rest wait for the device
+    await asyncio.sleep(0.01)
+    queued = [
+        hass.async_create_task(coordinator.async_route_input_to_output(input_num, 2))
+        for input_num in (1, 2, 3, 4)
+    ]
+    queued.append(hass.async_create_task(coordinator.async_output_off(3)))
+    queued.append(hass.async_create_task(coordinator.async_output_on(3)))
+
+    assert all(await asyncio.gather(first, *queued))
+
+    # Only the last route of output 2 and output 3's last state are sent
+    assert sent_commands(simulator, since) == ["OUT01:02.", "@OUT03.", "OUT02:04."]
+    assert simulator.routes[2] == 4
+    assert coordinator.data.route(1) == 2
+    assert coordinator.data.route(2) == 4
+    assert coordinator.desired_routes[2] == 4
+
+
+async def test_unacknowledged_commands_not_applied(
+    coordinator: AVGearMatrixDataUpdateCoordinator, simulator: MatrixSimulator
+) -> None:
+    """Test a batch the matrix did not answer leaves the state alone."""
+    version = coordinator.data.version
+    # Switched off at the device, it no longer answers routing commands
+    simulator.power = False
+
+    assert not await coordinator.async_route_input_to_output(3, 2)
+
+    assert coordinator.data.version == version
+    assert coordinator.data.route(2) == 1
+    assert coordinator.desired_routes.get(2) != 3
@@ -0,0 +1,217 @@
+"""Tests for the config flow."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from unittest.mock import patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.config_entries import SOURCE_USER
+from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+
+from benchmarks.simulator import MatrixSimulator, SimulatorConfig
+from custom_components.avgear_matrix.config_flow import CONF_DEVICE, CONF_SUBNET
+from custom_components.avgear_matrix.const import DOMAIN
+from custom_components.avgear_matrix.discovery import async_identify
+
+from .conftest import HOST
+
+
+@pytest.fixture(autouse=True)
+def mock_setup_entry() -> AsyncIterator[None]:
+    """Keep created entries from connecting."""
+    with patch(
+        "custom_components.avgear_matrix.async_setup_entry", return_value=True
+    ):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def mock_source_ip() -> AsyncIterator[None]:
+    """Put Home Assistant on a fixed address."""
+    with patch(
+        "custom_components.avgear_matrix.config_flow.network.async_get_source_ip",
+        return_value="192.168.1.10",
+    ):
+        yield
+
+
+@pytest.fixture
+async def silent_port() -> AsyncIterator[int]:
+    """Run a server that accepts connections but never answers."""
+
+    async def _handle_client(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        await reader.read()
+        writer.close()
+
+    server = await asyncio.start_server(_handle_client, HOST, 0)
+    yield server.sockets[0].getsockname()[1]
+    server.close()
+
+
+async def _async_free_port() -> int:
+    """Return a port nothing listens on."""
+    server = await asyncio.start_server(lambda reader, writer: None, HOST, 0)
+    port = server.sockets[0].getsockname()[1]
+    server.close()
+    await server.wait_closed()
+    return port
+
+
+async def _async_start(hass: HomeAssistant, step: str) -> str:
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": SOURCE_USER}
+    )
+    assert result["type"] is FlowResultType.MENU
+    assert result["menu_options"] == ["discover", "manual"]
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"next_step_id": step}
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == step
+    return result["flow_id"]
+
+
+async def test_discover_suggests_own_subnet(hass: HomeAssistant) -> None:
+    """Test the scan form suggests the /24 Home Assistant is on."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"next_step_id": "discover"}
+    )
+
+    schema = result["data_schema"].schema
+    subnet = next(key for key in schema if key == CONF_SUBNET)
+    assert subnet.default() == "192.168.1.0/24"
+
+
+@pytest.mark.parametrize(
+    ("subnet", "error"),
+    [("not a subnet", "invalid_subnet"), ("10.0.0.0/16", "subnet_too_large")],
+)
+async def test_discover_invalid_subnet(
+    hass: HomeAssistant, subnet: str, error: str
+) -> None:
+    """Test subnets that cannot be scanned are refused."""
+    flow_id = await _async_start(hass, "discover")
+
+    result = await hass.config_entries.flow.async_configure(
+        flow_id, {CONF_SUBNET: subnet, CONF_PORT: 4001}
+    )
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {CONF_SUBNET: error}
+
+
+async def test_discover_and_pick(
+    hass: HomeAssistant, simulator: MatrixSimulator
+) -> None:
+    """Test a discovered matrix is offered and picked."""
+    flow_id = await _async_start(hass, "discover")
+
+    result = await hass.config_entries.flow.async_configure(
+        flow_id, {CONF_SUBNET: f"{HOST}/32", CONF_PORT: simulator.port}
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "pick"
+
+    result = await hass.config_entries.flow.async_configure(
+        flow_id, {CONF_DEVICE: f"{HOST}:{simulator.port}"}
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["data"] == {CONF_HOST: HOST, CONF_PORT: simulator.port}
+    assert result["result"].unique_id == f"{HOST}:{simulator.port}"
+
+
+async def test_discover_skips_configured(
+    hass: HomeAssistant, simulator: MatrixSimulator
+) -> None:
+    """Test matrices that are already set up are not offered again."""
+    MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_HOST: HOST, CONF_PORT: simulator.port},
+        unique_id=f"{HOST}:{simulator.port}",
+    ).add_to_hass(hass)
+    flow_id = await _async_start(hass, "discover")
+
+    result = await hass.config_entries.flow.async_configure(
+        flow_id, {CONF_SUBNET: f"{HOST}/32", CONF_PORT: simulator.port}
+    )
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"base": "no_devices_found"}
+
+
+async def test_discover_nothing_found(hass: HomeAssistant) -> None:
+    """Test a scan without any matrices shows an error."""
+    flow_id = await _async_start(hass, "discover")
+
+    result = await hass.config_entries.flow.async_configure(
+        flow_id, {CONF_SUBNET: f"{HOST}/32", CONF_PORT: await _async_free_port()}
+    )
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"base": "no_devices_found"}
+
+
+async def test_manual(hass: HomeAssistant, simulator: MatrixSimulator) -> None:
+    """Test a matrix entered by hand is added."""
+    flow_id = await _async_start(hass, "manual")
+
+    result = await hass.config_entries.flow.async_configure(
+        flow_id, {CONF_HOST: HOST, CONF_PORT: simulator.port}
+    )
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["title"] == f"AVGear Matrix ({HOST}:{simulator.port})"
+    assert result["data"] == {CONF_HOST: HOST, CONF_PORT: simulator.port}
+
+
+async def test_manual_cannot_connect(hass: HomeAssistant) -> None:
+    """Test a port nothing listens on is reported."""
+    flow_id = await _async_start(hass, "manual")
+
+    result = await hass.config_entries.flow.async_configure(
+        flow_id, {CONF_HOST: HOST, CONF_PORT: await _async_free_port()}
+    )
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"base": "cannot_connect"}
+
+
+async def test_manual_unsupported_model(
+    hass: HomeAssistant, silent_port: int
+) -> None:
+    """Test a device that does not identify itself is refused."""
+    flow_id = await _async_start(hass, "manual")
+
+    result = await hass.config_entries.flow.async_configure(
+        flow_id, {CONF_HOST: HOST, CONF_PORT: silent_port}
+    )
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"base": "unsupported_model"}
+
+
+async def test_identify_skips_banner() -> None:
+    """Test a multi-line banner is not taken for slow replies."""
+    simulator = MatrixSimulator(
+        SimulatorConfig(banner="Welcome\r\nHDMI Matrix\r\n", latency=0.2)
+    )
+    await simulator.start(HOST)
+    try:
+        matrix = await async_identify(HOST, simulator.port)
+    finally:
+        await simulator.stop()
+
+    assert matrix is not None
+    assert matrix.name == simulator.config.model
+    assert matrix.device_type == simulator.config.device_type
@@ -0,0 +1,50 @@
+"""Tests for the state changed event."""
+
+from __future__ import annotations
+
+import pytest
+from pytest_homeassistant_custom_component.common import async_capture_events
+
+from homeassistant.core import Event, HomeAssistant
+
+from benchmarks.simulator import MatrixSimulator
+from custom_components.avgear_matrix.const import EVENT_STATE_CHANGED
+from custom_components.avgear_matrix.coordinator import (
+    AVGearMatrixDataUpdateCoordinator,
+)
+
+
+@pytest.fixture
+def events(hass: HomeAssistant) -> list[Event]:
+    """Capture the state changed events, from before the entry is set up."""
+    return async_capture_events(hass, EVENT_STATE_CHANGED)
+
+
+async def test_one_event_per_change(
+    hass: HomeAssistant,
+    events: list[Event],
+    coordinator: AVGearMatrixDataUpdateCoordinator,
+    simulator: MatrixSimulator,
+) -> None:
+    """Test an event fires once per batch of changes, never on the first state."""
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert events == []
+
+    # Changed on the front panel
+    simulator.routes[2] = 3
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert len(events) == 1
+    data = events[0].data
+    assert data["config_entry_id"] == coordinator.config_entry.entry_id
+    assert data["routes"] == {"2": 3}
+    assert "output_power" not in data
+    assert "timestamp" in data
+
+    assert await coordinator.async_apply_routes({1: 2, 3: 4})
+    await hass.async_block_till_done()
+
+    assert len(events) == 2
+    assert events[1].data["routes"] == {"1": 2, "3": 4}
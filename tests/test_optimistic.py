@@ -0,0 +1,86 @@
+"""Tests for optimistic routing."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from benchmarks.simulator import MatrixSimulator
+from custom_components.avgear_matrix.const import CONF_OPTIMISTIC_ROUTING
+from custom_components.avgear_matrix.coordinator import (
+    AVGearMatrixDataUpdateCoordinator,
+)
+
+READBACK_DELAY = 0.05
+
+pytestmark = [
+    pytest.mark.parametrize("options", [{CONF_OPTIMISTIC_ROUTING: True}]),
+    pytest.mark.usefixtures("short_readback_delay"),
+]
+
+
+@pytest.fixture
+def short_readback_delay(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Read optimistic routes back after a fraction of a second."""
+    monkeypatch.setattr(
+        "custom_components.avgear_matrix.coordinator.READBACK_DELAY", READBACK_DELAY
+    )
+
+
+async def test_failed_route_rolled_back(
+    hass: HomeAssistant,
+    coordinator: AVGearMatrixDataUpdateCoordinator,
+    simulator: MatrixSimulator,
+) -> None:
+    """Test a route the matrix did not take goes back to the previous input."""
+    # Switched off at the device, it no longer answers routing commands
+    simulator.power = False
+
+    coordinator.async_route_optimistically(3, 2)
+    assert coordinator.data.route(2) == 3
+
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert coordinator.data.route(2) == 1
+    assert simulator.routes[2] == 1
+
+
+async def test_rejected_route_replaced_after_readback(
+    hass: HomeAssistant,
+    coordinator: AVGearMatrixDataUpdateCoordinator,
+    simulator: MatrixSimulator,
+) -> None:
+    """Test the read-back shows the route the matrix kept instead of the sent one."""
+    coordinator.async_route_optimistically(3, 2)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert coordinator.data.route(2) == 3
+    # Acknowledged, but the matrix went back to the old input
+    simulator.routes[2] = 1
+
+    await asyncio.sleep(READBACK_DELAY * 2)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert coordinator.data.route(2) == 1
+
+
+async def test_poll_does_not_undo_unsent_route(
+    hass: HomeAssistant,
+    coordinator: AVGearMatrixDataUpdateCoordinator,
+    simulator: MatrixSimulator,
+) -> None:
+    """Test a poll reply from before an optimistic route was sent keeps it."""
+    simulator.config.latency = 0.1
+    poll = hass.async_create_task(coordinator.async_refresh())
+    # The poll holds the device, the route waits behind it
+    await asyncio.sleep(0.02)
+
+    coordinator.async_route_optimistically(3, 2)
+    await poll
+
+    assert coordinator.data.route(2) == 3
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert simulator.routes[2] == 3
+    assert coordinator.data.route(2) == 3
@@ -0,0 +1,26 @@
+"""Tests for powering several outputs at once."""
+
+from __future__ import annotations
+
+from benchmarks.simulator import MatrixSimulator
+from custom_components.avgear_matrix.coordinator import (
+    AVGearMatrixDataUpdateCoordinator,
+)
+
+
+async def test_output_power_batch(
+    coordinator: AVGearMatrixDataUpdateCoordinator, simulator: MatrixSimulator
+) -> None:
+    """Test several outputs are switched in one batch with one read-back."""
+    since = len(simulator.stats.commands)
+
+    assert await coordinator.async_set_outputs_power({1: False, 2: False, 3: True})
+
+    # Output 3 is on already
+    assert simulator.stats.commands[since:] == ["$OUT01.", "$OUT02.", "STA_POUT."]
+    assert coordinator.data.output_power_dict() == {
+        1: False,
+        2: False,
+        3: True,
+        4: True,
+    }
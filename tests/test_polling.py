@@ -0,0 +1,51 @@
+"""Tests for poll scheduling."""
+
+from __future__ import annotations
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import HomeAssistant
+
+from benchmarks.simulator import MatrixSimulator, SimulatorConfig
+from custom_components.avgear_matrix.const import DOMAIN
+from custom_components.avgear_matrix.coordinator import (
+    AVGearMatrixDataUpdateCoordinator,
+)
+
+from .conftest import HOST
+
+
+async def test_first_interval_offset_by_phase(
+    coordinator: AVGearMatrixDataUpdateCoordinator,
+) -> None:
+    """Test only the interval after the first poll is stretched by the phase."""
+    scan_interval = coordinator.scan_interval
+    first = coordinator.update_interval
+    assert scan_interval <= first < 2 * scan_interval
+
+    await coordinator.async_refresh()
+
+    # Backing off from the scan interval again, no longer offset
+    assert coordinator.update_interval == 2 * scan_interval
+
+
+async def test_phase_differs_between_matrices(
+    hass: HomeAssistant, coordinator: AVGearMatrixDataUpdateCoordinator
+) -> None:
+    """Test matrices set up together get different first intervals."""
+    simulator = MatrixSimulator(SimulatorConfig(banner="Welcome\r\n"))
+    await simulator.start(HOST)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_HOST: HOST, CONF_PORT: simulator.port},
+        unique_id=f"{HOST}:{simulator.port}",
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert entry.runtime_data.update_interval != coordinator.update_interval
+
+    await hass.config_entries.async_unload(entry.entry_id)
+    await simulator.stop()
@@ -0,0 +1,96 @@
+"""Tests for re-applying the desired routing after a power cycle."""
+
+from __future__ import annotations
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+
+from benchmarks.simulator import MatrixSimulator
+from custom_components.avgear_matrix.coordinator import (
+    AVGearMatrixDataUpdateCoordinator,
+)
+
+from .conftest import HOST, sent_commands
+
+
+async def test_routing_restored_after_power_cycle(
+    coordinator: AVGearMatrixDataUpdateCoordinator, simulator: MatrixSimulator
+) -> None:
+    """Test routes and output power the device lost are sent once."""
+    assert await coordinator.async_apply_routes({2: 3, 3: 4})
+    # Changed on the front panel, adopted as desired
+    simulator.output_power[4] = False
+    await coordinator.async_refresh()
+    assert coordinator.desired_output_power[4] is False
+
+    simulator.power = False
+    await coordinator.async_refresh()
+    assert coordinator.data.power is False
+
+    # Back on with the firmware defaults
+    simulator.power = True
+    simulator.routes = dict.fromkeys(simulator.routes, 1)
+    simulator.output_power = dict.fromkeys(simulator.output_power, True)
+    since = len(simulator.stats.commands)
+    await coordinator.async_refresh()
+
+    assert sorted(sent_commands(simulator, since)) == [
+        "$OUT04.",
+        "OUT02:03.",
+        "OUT03:04.",
+    ]
+    assert simulator.routes == {1: 1, 2: 3, 3: 4, 4: 1}
+    assert coordinator.data.routes_dict() == simulator.routes
+
+    # Nothing left to re-apply
+    since = len(simulator.stats.commands)
+    await coordinator.async_refresh()
+    assert sent_commands(simulator, since) == []
+
+
+async def test_front_panel_change_kept_after_transient_failure(
+    coordinator: AVGearMatrixDataUpdateCoordinator, simulator: MatrixSimulator
+) -> None:
+    """Test a single failed poll does not revert a change made meanwhile."""
+    assert await coordinator.async_apply_routes({2: 3})
+
+    await simulator.stop()
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    assert coordinator.breaker.closed
+
+    simulator.routes[2] = 4
+    await simulator.start(HOST, simulator.port)
+    since = len(simulator.stats.commands)
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert sent_commands(simulator, since) == []
+    assert simulator.routes[2] == 4
+    assert coordinator.data.route(2) == 4
+    assert coordinator.desired_routes[2] == 4
+
+
+async def test_desired_routing_restored_after_restart(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    coordinator: AVGearMatrixDataUpdateCoordinator,
+    simulator: MatrixSimulator,
+) -> None:
+    """Test the desired routing survives a restart and is re-applied."""
+    assert await coordinator.async_apply_routes({2: 3})
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+    # Power cycled while Home Assistant was down
+    simulator.routes = dict.fromkeys(simulator.routes, 1)
+    since = len(simulator.stats.commands)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    # The first refresh runs in the background after a fast start
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    coordinator = config_entry.runtime_data
+    assert coordinator.desired_routes[2] == 3
+    assert sent_commands(simulator, since) == ["OUT02:03."]
+    assert simulator.routes[2] == 3
+    assert coordinator.data.route(2) == 3
@@ -0,0 +1,83 @@
+"""Tests for the priority lock handing out the device."""
+
+from __future__ import annotations
+
+import asyncio
+from time import monotonic
+
+from custom_components.avgear_matrix.scheduler import (
+    PRIORITY_COMMAND,
+    PRIORITY_POLL,
+    PriorityLock,
+)
+from custom_components.avgear_matrix.stats import AVGearMatrixStats
+
+
+async def test_commands_served_before_polls() -> None:
+    """Test queued commands get the device before a poll queued earlier."""
+    lock = PriorityLock(10, AVGearMatrixStats())
+    order: list[str] = []
+
+    async def _async_use(priority: int, name: str) -> None:
+        async with lock.acquire(priority):
+            order.append(name)
+
+    async with lock.acquire(PRIORITY_POLL):
+        tasks = [
+            asyncio.create_task(_async_use(PRIORITY_POLL, "poll")),
+            asyncio.create_task(_async_use(PRIORITY_COMMAND, "command 1")),
+            asyncio.create_task(_async_use(PRIORITY_COMMAND, "command 2")),
+        ]
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+
+    assert order == ["command 1", "command 2", "poll"]
+    assert not lock.locked()
+
+
+async def test_polls_not_starved_by_commands() -> None:
+    """Test a poll waiting longer than max_wait goes before newer commands."""
+    stats = AVGearMatrixStats()
+    lock = PriorityLock(0.05, stats)
+    end = monotonic() + 0.5
+    served: dict[str, float] = {}
+
+    async def _async_command_stream() -> None:
+        # Always another command waiting while one holds the lock
+        while monotonic() < end:
+            async with lock.acquire(PRIORITY_COMMAND):
+                await asyncio.sleep(0.01)
+
+    async def _async_poll() -> None:
+        queued = monotonic()
+        async with lock.acquire(PRIORITY_POLL):
+            served["poll"] = monotonic() - queued
+
+    streams = [asyncio.create_task(_async_command_stream()) for _ in range(2)]
+    await asyncio.sleep(0.02)
+    await _async_poll()
+    await asyncio.gather(*streams)
+
+    # Served after about max_wait plus one command, long before the stream ends
+    assert served["poll"] < 0.2
+    assert stats.lock_wait["poll"].count == 1
+    assert stats.lock_wait["command"].count > 10
+
+
+async def test_cancelled_waiter_passes_the_lock_on() -> None:
+    """Test cancelling a waiter neither loses nor keeps the lock."""
+    lock = PriorityLock(10, AVGearMatrixStats())
+
+    async def _async_use() -> None:
+        async with lock.acquire(PRIORITY_COMMAND):
+            pass
+
+    async with lock.acquire(PRIORITY_POLL):
+        cancelled = asyncio.create_task(_async_use())
+        waiting = asyncio.create_task(_async_use())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+    await waiting
+
+    assert cancelled.cancelled()
+    assert not lock.locked()
@@ -0,0 +1,67 @@
+"""Tests for the persistent session."""
+
+from __future__ import annotations
+
+import asyncio
+
+from benchmarks.simulator import MatrixSimulator
+from custom_components.avgear_matrix.coordinator import (
+    AVGearMatrixDataUpdateCoordinator,
+)
+
+
+async def test_session_kept_between_polls(
+    coordinator: AVGearMatrixDataUpdateCoordinator, simulator: MatrixSimulator
+) -> None:
+    """Test polls reuse the connection opened during setup."""
+    connections = simulator.stats.connections
+
+    for _ in range(3):
+        await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert simulator.stats.connections == connections
+
+
+async def test_session_reconnects_after_drop(
+    coordinator: AVGearMatrixDataUpdateCoordinator, simulator: MatrixSimulator
+) -> None:
+    """Test a connection the device dropped is replaced transparently."""
+    connections = simulator.stats.connections
+    simulator.drop_clients()
+    await asyncio.sleep(0.01)
+    simulator.routes[2] = 3
+
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.data.route(2) == 3
+    assert simulator.stats.connections == connections + 1
+    assert coordinator.stats.reconnects == 1
+    assert coordinator.breaker.closed
+
+
+async def test_idle_close_racing_poll(
+    coordinator: AVGearMatrixDataUpdateCoordinator, simulator: MatrixSimulator
+) -> None:
+    """Test closing an idle session does not clear a connection opened meanwhile."""
+    session = coordinator.session
+    connections = simulator.stats.connections
+    writer = coordinator.matrix.writer
+    wait_closed = writer.wait_closed
+
+    async def slow_wait_closed() -> None:
+        await wait_closed()
+        await asyncio.sleep(0.1)
+
+    writer.wait_closed = slow_wait_closed
+    simulator.config.latency = 0.2
+
+    close = asyncio.create_task(session._async_idle_timeout(None))
+    await asyncio.sleep(0)
+    await coordinator.async_refresh()
+    await close
+
+    assert coordinator.last_update_success
+    assert simulator.stats.connections == connections + 1
+    assert session.connected
@@ -0,0 +1,81 @@
+"""Tests for the snapshot and restore actions."""
+
+from __future__ import annotations
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+
+from benchmarks.simulator import MatrixSimulator
+from custom_components.avgear_matrix.const import (
+    ATTR_CONFIG_ENTRY_ID,
+    DATA_OUTPUT_POWER,
+    DATA_ROUTING,
+    DOMAIN,
+)
+from custom_components.avgear_matrix.coordinator import (
+    AVGearMatrixDataUpdateCoordinator,
+)
+
+from .conftest import sent_commands
+
+
+async def _async_snapshot(hass: HomeAssistant, config_entry: MockConfigEntry) -> dict:
+    return await hass.services.async_call(
+        DOMAIN,
+        "snapshot",
+        {ATTR_CONFIG_ENTRY_ID: config_entry.entry_id, "name": "scene"},
+        blocking=True,
+        return_response=True,
+    )
+
+
+async def _async_restore(hass: HomeAssistant, config_entry: MockConfigEntry) -> None:
+    await hass.services.async_call(
+        DOMAIN,
+        "restore",
+        {ATTR_CONFIG_ENTRY_ID: config_entry.entry_id, "name": "scene"},
+        blocking=True,
+    )
+
+
+async def test_restore_unchanged_sends_nothing(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    simulator: MatrixSimulator,
+) -> None:
+    """Test restoring a snapshot the matrix still matches sends no commands."""
+    snapshot = await _async_snapshot(hass, config_entry)
+    assert snapshot == {
+        "routes": {"1": 1, "2": 1, "3": 1, "4": 1},
+        "output_power": {"1": True, "2": True, "3": True, "4": True},
+    }
+    since = len(simulator.stats.commands)
+
+    await _async_restore(hass, config_entry)
+
+    assert sent_commands(simulator, since) == []
+
+
+async def test_restore_sends_only_drift(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    coordinator: AVGearMatrixDataUpdateCoordinator,
+    simulator: MatrixSimulator,
+) -> None:
+    """Test restoring a drifted matrix sends only what differs, in one batch."""
+    await _async_snapshot(hass, config_entry)
+    # Changed at the front panel
+    simulator.routes[2] = 3
+    simulator.routes[4] = 2
+    simulator.output_power[4] = False
+    await coordinator.async_refresh_data(DATA_ROUTING, DATA_OUTPUT_POWER)
+    since = len(simulator.stats.commands)
+
+    await _async_restore(hass, config_entry)
+
+    # Output 2 is still on, only its route is sent
+    assert sent_commands(simulator, since) == ["@OUT04.", "OUT02:01.", "OUT04:01."]
+    assert simulator.routes == {1: 1, 2: 1, 3: 1, 4: 1}
+    assert all(simulator.output_power.values())
+    assert coordinator.data.routes_dict() == simulator.routes
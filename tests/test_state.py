@@ -0,0 +1,87 @@
+"""Tests for the matrix state snapshots."""
+
+from __future__ import annotations
+
+from custom_components.avgear_matrix.state import MatrixState
+
+STATE = MatrixState().evolve(
+    routes={1: 1, 2: 3, 3: 2},
+    output_power={1: True, 2: False},
+    power=True,
+    hdbt_power=True,
+)
+
+
+def test_evolve_unchanged_returns_self() -> None:
+    """Test evolving to the same values returns the very same snapshot."""
+    assert STATE.evolve() is STATE
+    assert STATE.evolve(routes={2: 3}, output_power={1: True}, power=True) is STATE
+
+
+def test_evolve_bumps_version() -> None:
+    """Test every change gives a new snapshot one version up."""
+    assert STATE.version == 1
+
+    state = STATE.evolve(routes={2: 4})
+
+    assert state is not STATE
+    assert state.version == 2
+    assert state.route(2) == 4
+    # The old snapshot is never modified
+    assert STATE.route(2) == 3
+
+
+def test_evolve_routes() -> None:
+    """Test routes are extended as needed and None makes a route unknown."""
+    assert STATE.routes == (1, 3, 2)
+    assert STATE.route(4) is None
+    assert STATE.route(0) is None
+
+    state = STATE.evolve(routes={2: None, 5: 4})
+
+    assert state.routes == (1, 0, 2, 0, 4)
+    assert state.route(2) is None
+    assert state.routes_dict() == {1: 1, 3: 2, 5: 4}
+
+
+def test_evolve_output_power() -> None:
+    """Test output power is tracked as known and on bitmasks."""
+    assert (STATE.output_power_known, STATE.output_power_on) == (0b11, 0b01)
+    assert STATE.output_power(1) is True
+    assert STATE.output_power(2) is False
+    assert STATE.output_power(3) is None
+
+    state = STATE.evolve(output_power={1: None, 2: True, 4: False})
+
+    assert (state.output_power_known, state.output_power_on) == (0b1010, 0b0010)
+    assert state.output_power(1) is None
+    assert state.output_power(2) is True
+    assert state.output_power(4) is False
+    assert state.output_power_dict() == {2: True, 4: False}
+
+
+def test_diff_only_changed() -> None:
+    """Test diff reports only what changed, with None for what became unknown."""
+    state = STATE.evolve(
+        routes={2: 4, 3: None}, output_power={1: None, 2: True}, hdbt_power=False
+    )
+
+    assert state.diff(STATE) == {
+        "hdbt_power": False,
+        "routes": {2: 4, 3: None},
+        "output_power": {1: None, 2: True},
+    }
+    assert STATE.diff(state) == {
+        "hdbt_power": True,
+        "routes": {2: 3, 3: 2},
+        "output_power": {1: True, 2: False},
+    }
+
+
+def test_diff_unchanged_empty() -> None:
+    """Test diff is empty when nothing changed, even across versions."""
+    assert STATE.diff(STATE) == {}
+    # Changed and changed back
+    state = STATE.evolve(routes={2: 4}).evolve(routes={2: 3})
+    assert state.version == 3
+    assert state.diff(STATE) == {}
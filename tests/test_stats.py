@@ -0,0 +1,39 @@
+"""Tests for the traffic statistics."""
+
+from __future__ import annotations
+
+from benchmarks.simulator import MatrixSimulator
+from custom_components.avgear_matrix.coordinator import (
+    AVGearMatrixDataUpdateCoordinator,
+)
+
+
+async def test_matrix_off_no_timeouts(
+    coordinator: AVGearMatrixDataUpdateCoordinator, simulator: MatrixSimulator
+) -> None:
+    """Test the silence of a matrix that is off is not counted as timeouts."""
+    simulator.power = False
+    await coordinator.async_refresh()
+    assert coordinator.data.power is False
+    timeouts = coordinator.stats.timeouts
+    empty_replies = coordinator.stats.empty_replies
+
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.stats.timeouts == timeouts
+    assert coordinator.stats.empty_replies == empty_replies + 2
+    assert coordinator.stats.as_dict()["empty_replies"] == empty_replies + 2
+
+
+async def test_silent_reply_counted_as_timeout(
+    coordinator: AVGearMatrixDataUpdateCoordinator, simulator: MatrixSimulator
+) -> None:
+    """Test no reply from a matrix that is on counts as a timeout."""
+    timeouts = coordinator.stats.timeouts
+    simulator.power = False
+
+    await coordinator.async_refresh()
+
+    assert coordinator.stats.timeouts == timeouts + 1
@@ -0,0 +1,44 @@
+"""Tests for the per-operation deadlines."""
+
+from __future__ import annotations
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+
+from benchmarks.simulator import MatrixSimulator
+from custom_components.avgear_matrix.const import CONF_QUERY_TIMEOUT
+from custom_components.avgear_matrix.coordinator import (
+    AVGearMatrixDataUpdateCoordinator,
+)
+
+
+async def test_slow_matrix_resets_session(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    coordinator: AVGearMatrixDataUpdateCoordinator,
+    simulator: MatrixSimulator,
+) -> None:
+    """Test a reply slower than the query timeout fails the poll and resets."""
+    # Set after setup, the library's device info queries take longer than this
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_QUERY_TIMEOUT: 0.2}
+    )
+    writer = coordinator.matrix.writer
+    connections = simulator.stats.connections
+    simulator.config.latency = 0.5
+
+    await coordinator.async_refresh()
+
+    assert not coordinator.last_update_success
+    assert coordinator.stats.update_failures == 1
+    assert coordinator.stats.timeouts >= 1
+    assert writer.transport.is_closing()
+    assert not coordinator._lock.locked()
+
+    simulator.config.latency = 0
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.matrix.writer is not writer
+    assert simulator.stats.connections > connections